@@ -0,0 +1,264 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset import CACHE_DIR, _write_atomic, build_lock, frame_fingerprint
+from partial_stats import counts_quantile, value_counts
+from schema import CATEGORICAL_COLUMNS, RATING_COLUMNS, SURVEY_SCHEMA
+
+RATINGS = np.arange(6)
+
+# Fixed bin edges so cubes built from different slices of the data can be added
+# up; they reach past the schema's maximum, so no valid value is clipped
+AGE_BINS = np.arange(0, SURVEY_SCHEMA["Age"].maximum + 20, 10)
+DISTANCE_BINS = np.arange(0, SURVEY_SCHEMA["Flight Distance"].maximum + 200, 100)
+
+CUBE_TABLES = ["categorical", "ratings", "age", "distance"]
+
+# Part of the persisted cube's name: bump it when the bins or tables change
+CUBE_VERSION = 2
+
+# Columns identifying a cell of each cube table (everything but Count)
+CUBE_KEYS = {
+    "categorical": ["Column", "Value", "Satisfaction"],
+    "ratings": ["Service", "Rating", "Satisfaction"],
+    "age": ["Start", "End", "Satisfaction"],
+    "distance": ["Start", "End", "Satisfaction"],
+}
+
+
+def _codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+
+
+def _counts_by_satisfaction(codes, n_levels, sat_codes, n_sat):
+    # One bincount over (level, satisfaction) pairs; rows with a null in
+    # either column are dropped
+    valid = (codes >= 0) & (sat_codes >= 0)
+    counts = np.bincount(
+        codes[valid] * n_sat + sat_codes[valid], minlength=n_levels * n_sat
+    )
+    return counts.reshape(n_levels, n_sat)
+
+
+def _long_table(counts, levels, satisfaction, level_name):
+    return pd.DataFrame(
+        {
+            level_name: np.repeat(levels, len(satisfaction)),
+            "Satisfaction": np.tile(np.asarray(satisfaction), len(levels)),
+            "Count": counts.ravel(),
+        }
+    )
+
+
+def _histogram(values, edges, sat_codes, satisfaction):
+    values = np.asarray(values, dtype=np.float64)
+    bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+    bins[np.isnan(values)] = -1
+    counts = _counts_by_satisfaction(bins, len(edges) - 1, sat_codes, len(satisfaction))
+    table = _long_table(counts, np.arange(len(edges) - 1), satisfaction, "Bin")
+    table.insert(0, "Start", edges[table.pop("Bin")])
+    table.insert(1, "End", table["Start"] + (edges[1] - edges[0]))
+    return table
+
+
+def rating_matrix(df, columns=RATING_COLUMNS, by=None):
+    """Service x Rating (0-5) counts, optionally split by the levels of `by`.
+
+    Each rating column is counted with one np.bincount over
+    group * 6 + rating, so no long (melted) frame is ever built. With `by`
+    the result has a (group, service) MultiIndex.
+    """
+    if by is None:
+        group_codes, groups = np.zeros(len(df), dtype=np.int64), None
+    else:
+        group_codes, groups = _codes(df[by])
+    n_groups = 1 if groups is None else len(groups)
+
+    counts = np.empty((n_groups, len(columns), len(RATINGS)), dtype=np.int64)
+    for j, col in enumerate(columns):
+        ratings = df[col].to_numpy()
+        valid = (group_codes >= 0) & (ratings >= 0) & (ratings < len(RATINGS))
+        offsets = group_codes[valid] * len(RATINGS) + ratings[valid]
+        counts[:, j, :] = np.bincount(
+            offsets, minlength=n_groups * len(RATINGS)
+        ).reshape(n_groups, len(RATINGS))
+
+    if groups is None:
+        return pd.DataFrame(counts[0], index=pd.Index(columns), columns=RATINGS)
+    index = pd.MultiIndex.from_product([groups, columns], names=[by, None])
+    return pd.DataFrame(counts.reshape(-1, len(RATINGS)), index=index, columns=RATINGS)
+
+
+def build_cube(df):
+    """Counts behind every chart in display_charts, split by Satisfaction."""
+    sat_codes, satisfaction = _codes(df["Satisfaction"])
+    satisfaction = satisfaction.to_numpy()
+
+    categorical = []
+    for col in CATEGORICAL_COLUMNS:
+        codes, levels = _codes(df[col])
+        counts = _counts_by_satisfaction(
+            codes, len(levels), sat_codes, len(satisfaction)
+        )
+        table = _long_table(counts, levels.to_numpy(), satisfaction, "Value")
+        table.insert(0, "Column", col)
+        categorical.append(table)
+
+    ratings = (
+        rating_matrix(df, by="Satisfaction")
+        .rename_axis(index=["Satisfaction", "Service"], columns="Rating")
+        .stack()
+        .rename("Count")
+        .reset_index()
+    )
+
+    return {
+        "categorical": pd.concat(categorical, ignore_index=True),
+        "ratings": ratings[["Service", "Rating", "Satisfaction", "Count"]],
+        "age": _histogram(df["Age"], AGE_BINS, sat_codes, satisfaction),
+        "distance": _histogram(
+            df["Flight Distance"], DISTANCE_BINS, sat_codes, satisfaction
+        ),
+    }
+
+
+def merge_cubes(a, b):
+    """Cube of the union of two disjoint sets of rows: matching cells add up."""
+    return {
+        name: pd.concat([a[name], b[name]], ignore_index=True)
+        .groupby(keys, sort=False, as_index=False)["Count"]
+        .sum()
+        for name, keys in CUBE_KEYS.items()
+    }
+
+
+def save_cube(cube, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, table in cube.items():
+        _write_atomic(
+            os.path.join(directory, f"{name}.parquet"),
+            lambda tmp_path: table.to_parquet(tmp_path, index=False),
+        )
+
+
+def load_cube(directory):
+    return {
+        name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"))
+        for name in CUBE_TABLES
+    }
+
+
+def cube_directory(fingerprint, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"cube-v{CUBE_VERSION}-{fingerprint}")
+
+
+def get_cube(df, cache_dir=CACHE_DIR):
+    """Load the cube for this dataset version, building and persisting it once."""
+    directory = cube_directory(frame_fingerprint(df), cache_dir)
+    with build_lock(os.path.abspath(directory)):
+        try:
+            return load_cube(directory)
+        except (OSError, ValueError):
+            cube = build_cube(df)
+            save_cube(cube, directory)
+            return cube
+
+
+def category_counts(cube, column):
+    table = cube["categorical"]
+    table = table[table["Column"] == column]
+    counts = table.groupby("Value", sort=False)["Count"].sum()
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+def rating_pivot(cube, satisfaction=None):
+    """Service x Rating count matrix, optionally for one satisfaction level."""
+    table = cube["ratings"]
+    if satisfaction is not None:
+        table = table[table["Satisfaction"] == satisfaction]
+    pivot = table.pivot_table(
+        index="Service", columns="Rating", values="Count", aggfunc="sum"
+    )
+    return pivot.reindex(index=sorted(RATING_COLUMNS), columns=RATINGS, fill_value=0)
+
+
+def histogram_counts(cube, name):
+    counts = cube[name].groupby(["Start", "End"], as_index=False)["Count"].sum()
+    # Bins past the largest value in the data are left out of the charts
+    nonzero = np.flatnonzero(counts["Count"].to_numpy())
+    return counts.iloc[: nonzero[-1] + 1 if len(nonzero) else 0]
+
+
+def value_histogram(series, max_bars=50):
+    """Bars for the picker histogram: one per value, or `max_bars` equal-width
+    bins when a numeric column has more distinct values than that."""
+    uniques, counts = value_counts(series)
+    numeric = pd.api.types.is_numeric_dtype(series.dtype)
+    if not numeric or len(uniques) <= max_bars:
+        return pd.DataFrame({"Value": uniques.astype(str), "Count": counts})
+
+    edges = np.histogram_bin_edges(uniques.astype(np.float64), bins=max_bars)
+    bins = np.clip(np.searchsorted(edges, uniques, side="right") - 1, 0, max_bars - 1)
+    binned = np.bincount(bins, weights=counts, minlength=max_bars).astype(np.int64)
+    labels = [f"{low:,.0f}-{high:,.0f}" for low, high in zip(edges[:-1], edges[1:])]
+    return pd.DataFrame({"Value": labels, "Count": binned})
+
+
+def box_summary(series, max_outliers=500):
+    """Quartiles, Tukey fences and (a bounded sample of) outliers for a box plot."""
+    uniques, counts = value_counts(series)
+    values = uniques.astype(np.float64)
+    q1, median, q3 = (counts_quantile(values, counts, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+
+    # Outliers are drawn once per distinct value, evenly thinned past the budget
+    outliers = values[~inside]
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).astype(int)]
+
+    return {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": values[inside].min(),
+        "upperfence": values[inside].max(),
+        "mean": (values * counts).sum() / counts.sum(),
+        "outliers": outliers,
+    }
+
+
+def minmax_downsample(series, max_points=2000):
+    """Row positions and values keeping the min and max of each bucket of rows,
+    so spikes survive while at most `max_points` points are drawn."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Null codes (-1) become NaN, like nulls in numeric columns
+        codes = series.cat.codes.to_numpy()
+        values = np.where(codes < 0, np.nan, codes)
+    else:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    positions = np.arange(len(values))
+    if len(values) > max_points:
+        # Pad to a (buckets, size) grid and take both extremes of every row
+        size = -(-len(values) // (max_points // 2))
+        grid = np.full(size * (-(-len(values) // size)), np.nan)
+        grid[: len(values)] = values
+        grid = grid.reshape(-1, size)
+        offsets = np.arange(len(grid)) * size
+        lows = np.where(np.isnan(grid), np.inf, grid).argmin(axis=1) + offsets
+        highs = np.where(np.isnan(grid), -np.inf, grid).argmax(axis=1) + offsets
+        positions = np.unique(np.concatenate([lows, highs]))
+        positions = positions[positions < len(values)]
+        values = values[positions]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        labels = np.full(len(values), np.nan, dtype=object)
+        valid = ~np.isnan(values)
+        labels[valid] = series.cat.categories.to_numpy()[values[valid].astype(np.intp)]
+        values = labels
+    return positions, values
@@ -1,52 +1,115 @@
+import os
+
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from helper_functions import extended_describe
-
-
-def set_font_size(fig, size=36):
-    fig.update_layout(
-        font=dict(
-            size=size,
-        ),
-        title_font=dict(
-            size=size,
-        ),
-        legend=dict(
-            font=dict(
-                size=size,
-            )
-        ),
-        xaxis=dict(
-            title_font=dict(
-                size=size,
-            ),
-            tickfont=dict(
-                size=size,
-            ),
-        ),
-        yaxis=dict(
-            title_font=dict(
-                size=size,
-            ),
-            tickfont=dict(
-                size=size,
-            ),
-        ),
-    )
-    return fig
+from aggregates import (
+    box_summary,
+    build_cube,
+    get_cube,
+    minmax_downsample,
+    value_histogram,
+)
+from cache import CACHE, memoize, path_fingerprint
+from dataset import DATA_PATH, load_shared
+from delays import (
+    DELAY_COLUMNS,
+    DELAY_GROUPS,
+    ON_TIME_MINUTES,
+    delay_histogram,
+    delay_summary,
+)
+from filters import FILTER_COLUMNS, BitmapIndex, filter_frame, selection_key
+from helper_functions import extended_describe, format_numbers
+from profiling import display_profile, plotly_chart, profile_run, section
+from schema import RATING_COLUMNS
+from table_view import page_rows, search_mask, sort_order
+from warmup import Warmup, display_warmup, timed_import
+
+# Serve the artifacts of report.py instead of computing from the data
+REPORT_DIR = os.environ.get("APP_REPORT_DIR")
+
+# Fill the caches in the background once per server process (see prewarm)
+PREWARM = os.environ.get("APP_PREWARM", "1") == "1"
+
+# st.fragment is still experimental_fragment in older Streamlit releases
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_data(path, version):
+    # One memory-mapped frame per process, returned as is (no copy) to every
+    # session; `version` (path, mtime and size) picks up a new file on rerun
+    return load_shared(path)
 
 
-@st.cache_data
 def get_df():
-    return pd.read_csv("data/airline_merged_clean.csv")
+    return load_data(DATA_PATH, path_fingerprint(DATA_PATH))
+
+
+@memoize()
+def bitmap_index(data):
+    return BitmapIndex.from_frame(data)
+
+
+@memoize()
+def filtered_data(data, key):
+    return filter_frame(data, bitmap_index(data), dict(key))
+
+
+def display_filters(data):
+    index = bitmap_index(data)
+    selection = {}
+    st.header("Filtros")
+    for col in FILTER_COLUMNS:
+        selection[col] = st.multiselect(col, index.values(col))
+    with st.expander("Servicios"):
+        for col in RATING_COLUMNS:
+            selection[col] = st.multiselect(col, index.values(col))
+
+    # Counting only needs the bitmaps, no rows are touched
+    caption = f"{index.count(selection):,} de {index.rows:,} pasajeros"
+    st.caption(caption.replace(",", "."))
+    return filtered_data(data, selection_key(selection))
+
+
+@memoize()
+def table_order(data, sort_by, descending, query):
+    # Sorted and searched row positions; the rows themselves are only
+    # taken for the page on screen
+    if sort_by is None:
+        order = np.arange(len(data))
+    else:
+        order = sort_order(data, sort_by, descending)
+    if query:
+        order = order[search_mask(data, query)[order]]
+    return order
 
 
-@st.cache_data
 def display_tables(data):
-    st.dataframe(data)
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("Buscar")
+    with col2:
+        sort_by = st.selectbox("Ordenar por", data.columns, index=None)
+    with col3:
+        descending = st.toggle("Descendente")
+    with col4:
+        page_size = st.selectbox("Filas por página", [25, 50, 100, 500], index=1)
+
+    order = table_order(data, sort_by, descending, query.strip())
+    pages = max(1, -(-len(order) // page_size))
+    # A new search or order starts again from the first page
+    page = st.number_input(
+        "Página",
+        min_value=1,
+        max_value=pages,
+        key=f"page-{query}-{sort_by}-{descending}-{page_size}",
+    )
+    st.dataframe(page_rows(data, order, page, page_size))
+    rows = f"{len(order):,}".replace(",", ".")
+    st.caption(f"{rows} filas, página {page} de {pages}")
 
     with st.expander("Atributos"):
         st.markdown("""
@@ -80,464 +143,199 @@ def display_tables(data):
     return data
 
 
-@st.cache_data
-def display_descriptive_stats(data):
-    st.dataframe(extended_describe(data))
-
+@memoize(persist=True)
+def descriptive_stats(data):
+    return extended_describe(data)
 
-def display_charts(data):
-    col1, col2, col3 = st.columns(3)
 
-    with col1:
-        # Calculate the counts
-        counts = data["Type Of Travel"].value_counts()
-
-        # Convert the counts to a DataFrame
-        df_counts = pd.DataFrame(
-            {"Type Of Travel": counts.index, "Count": counts.values}
-        )
-
-        # Create a bar chart for 'Type Of Travel' using Plotly
-        fig = px.bar(
-            data_frame=df_counts,
-            x="Type Of Travel",
-            y="Count",
-            color="Type Of Travel",
-            color_discrete_map={
-                "Personal Travel": "SandyBrown",  # Vibrant orange for personal travel
-                "Business Travel": "#34495E",  # Navy blue for business travel
-            },
-            text="Count",
-            title="Total de pasajeros por Tipo de Viaje",
-            labels={
-                "Type Of Travel": "Tipo de Viaje",
-                "Count": "Pasajeros",
-            },
-        )
+def display_descriptive_stats(data):
+    st.dataframe(descriptive_stats(data))
 
-        fig.update_traces(textposition="auto", textfont_color="white")
-        fig = set_font_size(fig)
-        fig.update_layout(showlegend=False)
-        st.plotly_chart(fig)
 
-    with col2:
-        # Get counts of each gender
-        gender_counts = data["Gender"].value_counts()
-
-        # Create a pie chart
-        fig = px.pie(
-            gender_counts,
-            values=gender_counts.values,
-            names=gender_counts.index,
-            color=gender_counts.index,
-            color_discrete_map={"Female": "Orchid", "Male": "CornflowerBlue"},
-            title="Distribución de género de los pasajeros",
-        )
+@memoize()
+def load_cube(data):
+    # Filtered subsets only live in memory; the full dataset's cube is
+    # persisted next to the data by get_cube itself
+    if data.attrs.get("selection"):
+        return build_cube(data)
+    return get_cube(data)
 
-        fig.update_traces(textinfo="percent+value", textfont_color="white")
-        fig.update_layout(legend_title_text="Género", separators=",.")
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
+@memoize(persist=True)
+def picker_aggregate(data, column, plot_type):
+    # Only the aggregate reaches the browser, never one point per passenger
+    if plot_type == "Histograma":
+        return value_histogram(data[column])
+    elif plot_type == "Linea":
+        return minmax_downsample(data[column])
+    elif plot_type == "Box Plot":
+        return box_summary(data[column])
 
-    with col3:
-        fig = (
-            data["Satisfaction"]
-            .value_counts()
-            .reset_index()
-            .rename(columns={"Satisfaction": "Satisfaction", "count": "Count"})
-            .pipe(
-                px.pie,
-                names="Satisfaction",
-                values="Count",
-                color="Satisfaction",
-                color_discrete_map={
-                    "Neutral or Dissatisfied": "Crimson",
-                    "Satisfied": "Chartreuse",
-                },
-                title="Distribución de satisfacción de los pasajeros",
-                labels={
-                    "Satisfaction": "Nivel de Satisfacción",
-                    "Count": "Pasajeros",
-                },
-            )
-            .update_traces(
-                textposition="inside",
-                textinfo="percent+value",
-                textfont_color="white",
-            )
-        )
 
-        fig.update_layout(legend_title_text="Nivel de Satisfacción", separators=",.")
+def display_charts(data):
+    # plotly.express is slow to import; only the sections drawing charts pay for it
+    charts = timed_import("charts")
+    with section("Cubo"):
+        cube = load_cube(data)
+    columns = st.columns(3)
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
+    for column, name, figure in charts.CHARTS:
+        with columns[column], section(name):
+            plotly_chart(figure(cube))
 
-    with col1:
-        fig = px.histogram(
-            data,
-            x="Flight Distance",
-            nbins=50,
-            title="Distribución de Distancia de Vuelo",
-            color_discrete_sequence=["#636EFA"],
-            template="plotly_dark",
-        )
+    with columns[1], section("Promedios por servicio"):
+        display_service_averages(charts.service_averages(cube))
 
-        fig.update_traces(textposition="inside", texttemplate="%{y}", textfont_size=28)
 
-        fig.update_layout(
-            xaxis_title_text="Distancia de Vuelo (km)",
-            yaxis_title_text="Vuelos",
-            bargap=0.2,
-            bargroupgap=0.1,
-        )
+@memoize(persist=True)
+def delay_aggregate(data, column, by):
+    # Per-group histograms: tails without sorting the delays
+    return delay_summary(data, column, by), delay_histogram(data, column, by)
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
 
+def display_delays(data):
+    col1, col2 = st.columns(2)
+    with col1:
+        column = st.selectbox("Seleccione un retraso", DELAY_COLUMNS)
     with col2:
-        fig = px.histogram(
-            data,
-            x="Age",
-            title="Distribución de Edad",
-            color_discrete_sequence=["#636EFA"],
-            template="plotly_dark",
-            range_x=[0, 90],  # Adjusted to start from 0 and cover up to 90
-            nbins=9,  # Adjusted to create 9 bins, which will cover the range 0-90 in steps of 10
-        )
+        by = st.selectbox("Agrupar por", DELAY_GROUPS)
+
+    summary, histogram = delay_aggregate(data, column, by)
+    summary = summary.assign(
+        **{"A tiempo": summary["A tiempo"].map("{:.1%}".format)}
+    ).map(format_numbers)
+    st.dataframe(summary, hide_index=True)
+    st.caption(
+        f"A tiempo: {ON_TIME_MINUTES} minutos de retraso o menos. Los percentiles "
+        "se leen de histogramas logarítmicos (error menor al 9%)."
+    )
+    charts = timed_import("charts")
+    plotly_chart(charts.delay_histogram_figure(histogram, column, by))
 
-        fig.update_traces(textposition="inside", texttemplate="%{y}", textfont_size=28)
 
-        fig.update_layout(
-            xaxis_title_text="Edad",
-            yaxis_title_text="Pasajeros",
-            bargap=0.2,
-            bargroupgap=0.1,
-        )
+@memoize()
+def load_model(path):
+    # Keyed on the file's mtime: retraining is picked up on the next rerun
+    return timed_import("model").SatisfactionModel.load(path)
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
 
-    with col3:
-        class_counts = data["Class"].value_counts()
-
-        fig = px.pie(
-            class_counts,
-            values=class_counts.values,
-            names=class_counts.index,
-            color=class_counts.index,
-            color_discrete_map={
-                "Business": "LightBlue",
-                "Eco": "DarkSeaGreen",
-                "Eco Plus": "GreenYellow",
-            },
-            title="Distribución de clase de los pasajeros",
-        )
+def display_model(data):
+    # Only the (collapsed by default) model section needs model.py
+    model_path = timed_import("model").MODEL_PATH
+    if not os.path.exists(model_path):
+        st.info(f"Entrene el modelo con `python model.py train --model {model_path}`")
+        return
 
-        fig.update_traces(textinfo="percent+value", textfont_color="white")
-        fig.update_layout(legend_title_text="Clase", separators=",.")
+    model = load_model(model_path)
+    col1, col2 = st.columns(2)
+    with col1:
+        charts = timed_import("charts")
+        plotly_chart(charts.importance_figure(model.feature_importance()))
+    with col2:
+        # Scoring the (filtered) rows is a few table lookups per row
+        predicted = model.predict_proba(data)
+        actual = (data["Satisfaction"] == model.positive).to_numpy()
+        st.metric("Satisfacción predicha", f"{predicted.mean():.1%}")
+        st.metric("Satisfacción observada", f"{actual.mean():.1%}")
+        # The rows shown include the training rows, whose accuracy is
+        # optimistic; prefer the holdout measured by `model.py train`
+        if model.evaluation:
+            st.metric("Exactitud (validación)", f"{model.evaluation['accuracy']:.1%}")
+        else:
+            accuracy = ((predicted >= 0.5) == actual).mean()
+            st.metric("Exactitud (entrenamiento)", f"{accuracy:.1%}")
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
 
-    with col1:
-        customer_counts = data["Customer Type"].value_counts()
-
-        fig = px.pie(
-            customer_counts,
-            values=customer_counts.values,
-            names=customer_counts.index,
-            color=customer_counts.index,
-            color_discrete_map={
-                "Loyal Customer": "LightGreen",
-                "Disloyal Customer": "LightCoral",
-            },
-            title="Distribución de tipo de cliente",
-        )
+def display_service_averages(avg_df):
+    # Display each average rating with st.metric for a more appealing presentation
+    for index, row in avg_df.iterrows():
+        st.metric(label=row["Service"], value=f"{row['Average Rating']:.2f}")
 
-        fig.update_traces(textinfo="percent+value", textfont_color="white")
-        fig.update_layout(legend_title_text="Tipo de cliente", separators=",.")
+    st.table(avg_df)
 
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
 
-    with col2:
-        fig = px.histogram(
-            data_frame=data,
-            x="Gate Location",
-            title="Distribución de Satisfacción de Ubicación de Puerta",
-            labels={"Gate Location": "Nivel de Satisfacción"},
-            color_discrete_sequence=["#636EFA"],
-            category_orders={"Gate Location": [1, 2, 3, 4, 5]},
+def display_picker(data):
+    option_col1, option_col2, option_col3 = st.columns(3)
+    with option_col1:
+        plot_type = st.selectbox(
+            "Seleccione un tipo de gráfico", ["Histograma", "Linea", "Box Plot"]
         )
-        fig.update_layout(
-            xaxis_title_text="Nivel de Satisfacción",
-            yaxis_title_text="Frecuencia",
-            xaxis=dict(
-                tickmode="array",
-                tickvals=[1, 2, 3, 4, 5],
-                ticktext=["1", "2", "3", "4", "5"],
-                range=[
-                    0.5,
-                    5.5,
-                ],  # Sets the range of the x-axis to start from 1 and end at 5
-            ),
-            bargap=0.2,  # Adjusts the gap between bars
+    with option_col2:
+        column = st.selectbox("Seleccione una columna", data.columns)
+    with option_col3:
+        color_input = st.text_input(
+            "Ingrese una secuencia de colores (separados por comas)"
         )
 
-        fig.update_traces(textposition="inside", texttemplate="%{y}", textfont_size=28)
-        fig = set_font_size(fig)
-        st.plotly_chart(fig)
-
-    with col3:
-        # Define the columns to include
-        columns_to_include = [
-            "Inflight Wifi Service",
-            "Departure/Arrival Time Convenient",
-            "Ease Of Online Booking",
-            "Gate Location",
-            "Food And Drink",
-            "Online Boarding",
-            "Seat Comfort",
-            "Inflight Entertainment",
-            "On-Board Service",
-            "Leg Room Service",
-            "Baggage Handling",
-            "Checkin Service",
-            "Inflight Service",
-            "Cleanliness",
-        ]
-
-        # Filter the DataFrame to include only the specified columns
-        filtered_data = data[columns_to_include]
+    charts = timed_import("charts")
+    color_sequences = (
+        charts.px.colors.qualitative.Plotly
+        if not color_input
+        else color_input.split(",")
+    )
 
-        data_long = pd.melt(filtered_data, var_name="Servicio", value_name="Rating")
-        rating_counts = (
-            data_long.groupby(["Servicio", "Rating"])
-            .size()
-            .reset_index(name="Pasajeros")
-        )
+    if plot_type == "Box Plot" and not pd.api.types.is_numeric_dtype(data[column]):
+        st.warning("El Box Plot requiere una columna numérica")
+        return
 
-        pivot_table = rating_counts.pivot(
-            index="Servicio", columns="Rating", values="Pasajeros"
-        )
+    aggregate = picker_aggregate(data, column, plot_type)
+    fig = charts.picker_figure(aggregate, column, plot_type, color_sequences)
+    fig.update_layout(title=f"{plot_type} de {column}")
+    fig = charts.set_font_size(fig)
+    plotly_chart(fig)
 
-        pivot_table = pivot_table.reindex(columns=[0, 1, 2, 3, 4, 5], fill_value=0)
 
-        fig = px.imshow(
-            pivot_table,
-            labels=dict(x="Rating", y="Servicio", color="Pasajeros"),
-            x=[str(i) for i in range(0, 6)],
-            aspect="auto",
-            title="Service Satisfaction Heatmap",
-            color_continuous_scale="Viridis",
-        )
+@fragment
+def lazy_section(key, display, data, default=True):
+    # A fragment reruns on its own: the section's toggle and widgets only
+    # recompute this section, and a section that is switched off builds nothing
+    if st.toggle(f"Mostrar {key.lower()}", value=default, key=f"show-{key}"):
+        with section(key):
+            display(data)
 
-        fig.update_layout(
-            title_text="Satisfacción de los pasajeros por servicio",
-            title_x=0.5,
-            title_font=dict(size=24),
-            xaxis=dict(tickfont=dict(size=12)),
-            yaxis=dict(tickfont=dict(size=12), title=""),
-            autosize=False,
-            width=1000,
-            height=800,
-            coloraxis_colorbar=dict(
-                title="Pasajeros",
-                titleside="right",
-                titlefont=dict(size=12),
-                tickfont=dict(size=10),
-            ),
-        )
 
-        max_values_per_rating = pivot_table.max()
-        # Add annotations for each cell as before
-        for y in range(pivot_table.shape[0]):
-            for x in range(pivot_table.shape[1]):
-                value = pivot_table.iloc[y, x]
-                if pd.notnull(value) and value == max_values_per_rating[x]:
-                    # Highlight maximum values with bold text and attempt to draw a border
-                    text_color = "red"
-                    font_weight = "bold"
-                    text_value = "{:,}".format(int(value)).replace(",", ".")
-                    # Draw a red border around the cell
-                    fig.add_shape(
-                        type="rect",
-                        x0=x - 0.5,
-                        y0=y - 0.5,
-                        x1=x + 0.5,
-                        y1=y + 0.5,
-                        line=dict(color="red", width=2),
-                        fillcolor="rgba(0,0,0,0)",
-                    )  # Transparent fill
-                elif pd.notnull(value):
-                    # Normal color and weight for other values
-                    text_color = "white"
-                    font_weight = "normal"
-                    text_value = "{:,}".format(int(value)).replace(",", ".")
-                else:
-                    # Handle NaN values
-                    text_color = "white"
-                    font_weight = "normal"
-                    text_value = "N/A"
-
-                fig.add_annotation(
-                    x=x,
-                    y=y,
-                    text=text_value,
-                    showarrow=False,
-                    font=dict(color=text_color, weight=font_weight),
-                )
-
-        fig = set_font_size(fig, 30)
-        st.plotly_chart(fig)
+@memoize()
+def read_report(manifest_path):
+    # Keyed on the manifest's mtime: a new report is picked up on the next rerun
+    return timed_import("report").load_report(os.path.dirname(manifest_path))
 
-    with col1:
-        # Add 'Satisfaction' to the columns to include for filtering
-        columns_to_include.append("Satisfaction")
-
-        # The 'Satisfaction' column has two unique values: 'Neutral or Dissatisfied' and 'Satisfied'
-        # Loop through each unique satisfaction level
-        for satisfaction_level in ["Neutral or Dissatisfied", "Satisfied"]:
-            # Filter data for the current satisfaction level
-            filtered_data = data[data["Satisfaction"] == satisfaction_level][
-                columns_to_include
-            ]
-
-            # Melt, count, and pivot as before
-            data_long = pd.melt(
-                filtered_data,
-                id_vars=["Satisfaction"],
-                var_name="Servicio",
-                value_name="Rating",
-            )
-            rating_counts = (
-                data_long.groupby(["Servicio", "Rating"])
-                .size()
-                .reset_index(name="Pasajeros")
-            )
-            pivot_table = rating_counts.pivot(
-                index="Servicio", columns="Rating", values="Pasajeros"
-            ).reindex(columns=[0, 1, 2, 3, 4, 5], fill_value=0)
-
-            # Create heatmap
-            fig = px.imshow(
-                pivot_table,
-                labels=dict(x="Rating", y="Servicio", color="Pasajeros"),
-                x=[str(i) for i in range(0, 6)],
-                aspect="auto",
-                title=f"Service Satisfaction Heatmap for {satisfaction_level}",
-                color_continuous_scale="Viridis",
-            )
-
-            # Update layout with satisfaction level in title and remove y-axis label
-            fig.update_layout(
-                title_text=f"Satisfacción de los pasajeros por servicio <br>{satisfaction_level}",
-                title_x=0.5,
-                title_font=dict(size=24),
-                xaxis=dict(
-                    tickfont=dict(size=12), title="Rating"
-                ),  # Ensure x-axis is labeled
-                yaxis=dict(tickfont=dict(size=12), title=""),  # Remove y-axis label
-                autosize=False,
-                width=1000,
-                height=800,
-                coloraxis_colorbar=dict(
-                    title="Pasajeros",
-                    titleside="right",
-                    titlefont=dict(size=12),
-                    tickfont=dict(size=10),
-                ),
-            )
-
-            max_values_per_rating = pivot_table.max()
-            # Add annotations for each cell as before
-            for y in range(pivot_table.shape[0]):
-                for x in range(pivot_table.shape[1]):
-                    value = pivot_table.iloc[y, x]
-                    if pd.notnull(value) and value == max_values_per_rating[x]:
-                        # Highlight maximum values with bold text and attempt to draw a border
-                        text_color = "red"
-                        font_weight = "bold"
-                        text_value = "{:,}".format(int(value)).replace(",", ".")
-                        # Draw a red border around the cell
-                        fig.add_shape(
-                            type="rect",
-                            x0=x - 0.5,
-                            y0=y - 0.5,
-                            x1=x + 0.5,
-                            y1=y + 0.5,
-                            line=dict(color="red", width=2),
-                            fillcolor="rgba(0,0,0,0)",
-                        )  # Transparent fill
-                    elif pd.notnull(value):
-                        # Normal color and weight for other values
-                        text_color = "white"
-                        font_weight = "normal"
-                        text_value = "{:,}".format(int(value)).replace(",", ".")
-                    else:
-                        # Handle NaN values
-                        text_color = "white"
-                        font_weight = "normal"
-                        text_value = "N/A"
-
-                    fig.add_annotation(
-                        x=x,
-                        y=y,
-                        text=text_value,
-                        showarrow=False,
-                        font=dict(color=text_color, weight=font_weight),
-                    )
-
-            # Adjust font size and display the plot
-            fig = set_font_size(fig, 30)
-            st.plotly_chart(fig)
 
-    with col2:
-        # Step 1: Create a list of the column names you want to select
-        selected_columns = [
-            "Inflight Wifi Service",
-            "Departure/Arrival Time Convenient",
-            "Ease Of Online Booking",
-            "Gate Location",
-            "Food And Drink",
-            "Online Boarding",
-            "Seat Comfort",
-            "Inflight Entertainment",
-            "On-Board Service",
-            "Leg Room Service",
-            "Baggage Handling",
-            "Checkin Service",
-            "Inflight Service",
-            "Cleanliness",
-        ]
+def display_report(directory):
+    manifest_name = timed_import("report").MANIFEST
+    report = read_report(os.path.join(directory, manifest_name))
+    manifest = report["manifest"]
+    rows = f"{manifest['rows']:,}".replace(",", ".")
+    st.caption(f"Reporte precalculado de {rows} pasajeros ({manifest['created']})")
 
-        # Step 2: Use this list to select the specified columns from your DataFrame
-        selected_df = data[selected_columns]
+    st.subheader("🔍 :blue[Estadísticas descriptivas]")
+    st.dataframe(report["extended_describe"])
 
-        # Step 3: Calculate the average for each of the selected columns
-        averages = selected_df.mean()
+    st.subheader("📊 :blue[Gráficos]")
+    columns = st.columns(3)
+    for column, name, fig in report["figures"]:
+        with columns[column], section(name):
+            plotly_chart(fig)
 
-        # Step 4: Convert these averages into a format suitable for plotting
-        avg_df = pd.DataFrame(
-            {"Service": averages.index, "Average Rating": averages.values}
-        )
+    with columns[1]:
+        display_service_averages(report["averages"])
 
-        # Display each average rating with st.metric for a more appealing presentation
-        for index, row in avg_df.iterrows():
-            st.metric(label=row["Service"], value=f"{row['Average Rating']:.2f}")
 
-        st.table(avg_df)
+def display_page():
+    with section("Carga de datos"):
+        data = get_df()
 
+    with st.sidebar, section("Filtros"):
+        if st.button("Limpiar caché"):
+            CACHE.invalidate()
+            data = get_df()
+        data = display_filters(data)
 
-def main():
-    st.set_page_config(
-        page_title="Satisfaccion del Cliente", page_icon=":airplane:", layout="wide"
-    )
+    if data.empty:
+        st.warning("Ningún pasajero cumple con los filtros seleccionados")
+        return
 
-    st.title("🙋‍♂️ :blue[Satisfaccion del Cliente]")
-    data = get_df()
-    display_tables(data)
+    st.subheader("🗃️ :blue[Datos]")
+    lazy_section("Tablas", display_tables, data, default=False)
 
     st.markdown(
         """
@@ -551,39 +349,77 @@ def main():
     )
 
     st.subheader("🔍 :blue[Estadísticas descriptivas]")
-    display_descriptive_stats(data)
+    lazy_section("Estadísticas", display_descriptive_stats, data)
 
     st.subheader("🕵️ :blue[Visualizaciones]")
-    option_col1, option_col2, option_col3 = st.columns(3)
-    with option_col1:
-        plot_type = st.selectbox(
-            "Seleccione un tipo de gráfico", ["Histograma", "Linea", "Box Plot"]
-        )
-    with option_col2:
-        column = st.selectbox("Seleccione una columna", data.columns)
-    with option_col3:
-        color_input = st.text_input(
-            "Ingrese una secuencia de colores (separados por comas)"
-        )
+    lazy_section("Selector", display_picker, data)
 
-    color_sequences = (
-        px.colors.qualitative.Plotly if not color_input else color_input.split(",")
+    st.subheader("📊 :blue[Gráficos]")
+    lazy_section("Gráficos", display_charts, data)
+
+    st.subheader("⏱️ :blue[Retrasos]")
+    lazy_section("Retrasos", display_delays, data)
+
+    st.subheader("🤖 :blue[Modelo de satisfacción]")
+    lazy_section("Modelo", display_model, data, default=False)
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm():
+    # Once per server process, from its first rerun: a background thread
+    # imports the chart modules and fills the caches of the default sections
+    # while that rerun draws the page, so later visitors find them warm
+    if not PREWARM:
+        return None
+    if REPORT_DIR:
+
+        def report():
+            manifest_name = timed_import("report").MANIFEST
+            return read_report(os.path.join(REPORT_DIR, manifest_name))
+
+        return Warmup([("Reporte", report)]).start()
+
+    def data():
+        return load_data(DATA_PATH, path_fingerprint(DATA_PATH))
+
+    # The rerun itself starts from the top of the page; begin from the bottom
+    return Warmup(
+        [
+            ("Carga de datos", data),
+            ("Cubo", lambda: load_cube(data())),
+            (
+                "Retrasos",
+                lambda: delay_aggregate(data(), DELAY_COLUMNS[0], DELAY_GROUPS[0]),
+            ),
+            ("Estadísticas", lambda: descriptive_stats(data())),
+            ("Índice de filtros", lambda: bitmap_index(data())),
+        ]
+    ).start()
+
+
+def main():
+    st.set_page_config(
+        page_title="Satisfaccion del Cliente", page_icon=":airplane:", layout="wide"
     )
 
-    if plot_type == "Histograma":
-        fig = px.histogram(
-            data, x=column, color=column, color_discrete_sequence=color_sequences
-        )
-    elif plot_type == "Linea":
-        fig = px.line(data, x=column, template="plotly_dark")
-    elif plot_type == "Box Plot":
-        fig = px.box(data, x=column, template="plotly_dark")
-    fig.update_layout(title=f"{plot_type} de {column}")
-    fig = set_font_size(fig)
-    st.plotly_chart(fig)
+    st.title("🙋‍♂️ :blue[Satisfaccion del Cliente]")
 
-    st.subheader("📊 :blue[Gráficos]")
-    display_charts(data)
+    # Timings per section, also logged and appended to the metrics file
+    with st.sidebar:
+        debug = st.checkbox(
+            "Modo depuración", value=os.environ.get("APP_PROFILE") == "1"
+        )
+    warmup = prewarm()
+    with profile_run(debug) as profiler:
+        if REPORT_DIR:
+            display_report(REPORT_DIR)
+        else:
+            display_page()
+
+    if debug:
+        with st.sidebar:
+            display_profile(profiler)
+            display_warmup(warmup)
 
 
 if __name__ == "__main__":
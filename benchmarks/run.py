@@ -0,0 +1,166 @@
+# Time and peak memory of the dashboard's data path on synthetic surveys:
+#
+#     python -m benchmarks.run --rows 100000 1000000 --output bench.json
+#     python -m benchmarks.run --rows 100000 --baseline bench.json
+#
+# Results are JSON, one entry per (benchmark, rows), so runs on different
+# commits can be compared with --baseline.
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_cube, rating_matrix
+from benchmarks.synthetic import SurveyModel
+from charts import CHARTS, service_averages
+from dataset import load_dataset, load_shared
+from delays import DELAY_GROUPS, delay_summary
+from helper_functions import extended_describe, summarize_dataframe
+
+
+def prepare_charts(df):
+    # Everything display_charts computes before handing figures to Streamlit
+    cube = build_cube(df)
+    return [figure(cube) for _, _, figure in CHARTS], service_averages(cube)
+
+
+def load_cold(path, cache_dir):
+    # get_df on a new file: CSV parse, normalize and Parquet write
+    for name in os.listdir(cache_dir):
+        os.remove(os.path.join(cache_dir, name))
+    return load_dataset(path, cache_dir)
+
+
+BENCHMARKS = {
+    "load_dataset_cold": lambda ctx: load_cold(ctx["csv"], ctx["cache_dir"]),
+    "load_dataset_warm": lambda ctx: load_dataset(ctx["csv"], ctx["cache_dir"]),
+    "load_shared_warm": lambda ctx: load_shared(ctx["csv"], ctx["cache_dir"]),
+    "summarize_dataframe": lambda ctx: summarize_dataframe(ctx["df"]),
+    "extended_describe": lambda ctx: extended_describe(ctx["df"]),
+    "rating_matrix": lambda ctx: rating_matrix(ctx["df"], by="Satisfaction"),
+    "prepare_charts": lambda ctx: prepare_charts(ctx["df"]),
+    "delay_summary": lambda ctx: [
+        delay_summary(ctx["df"], "Arrival Delay In Minutes", by) for by in DELAY_GROUPS
+    ],
+}
+
+
+def measure(func, ctx, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ctx)
+        times.append(time.perf_counter() - start)
+
+    # One extra traced run: tracemalloc slows allocations down, so it is
+    # kept out of the timings
+    tracemalloc.start()
+    try:
+        func(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(rows_list, names, repeat=3, seed=0):
+    model = SurveyModel.fit()
+    results = []
+    for rows in rows_list:
+        df = model.sample(rows, seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = {
+                "df": df,
+                "csv": os.path.join(tmp, "survey.csv"),
+                "cache_dir": os.path.join(tmp, "cache"),
+            }
+            model.to_raw(df).to_csv(ctx["csv"])
+            os.makedirs(ctx["cache_dir"])
+            for name in names:
+                result = {"benchmark": name, "rows": rows, "repeat": repeat}
+                result.update(measure(BENCHMARKS[name], ctx, repeat))
+                results.append(result)
+                print(
+                    f"{name:<22} {rows:>11,} filas  {result['seconds_median']:8.3f} s"
+                    f"  {result['peak_mb']:9.1f} MB"
+                )
+    return {"meta": metadata(), "results": results}
+
+
+def compare(report, baseline):
+    """Median time and peak memory of `report` relative to `baseline`."""
+    old = pd.DataFrame(baseline["results"]).set_index(["benchmark", "rows"])
+    new = pd.DataFrame(report["results"]).set_index(["benchmark", "rows"])
+    joined = new.join(old, rsuffix="_baseline", how="inner")
+    return pd.DataFrame(
+        {
+            "seconds": joined["seconds_median"],
+            "seconds_baseline": joined["seconds_median_baseline"],
+            "time_ratio": joined["seconds_median"] / joined["seconds_median_baseline"],
+            "memory_ratio": joined["peak_mb"] / joined["peak_mb_baseline"],
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks del dashboard con encuestas sintéticas"
+    )
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    parser.add_argument("--baseline", help="Resultados JSON de otro commit")
+    args = parser.parse_args()
+
+    report = run(args.rows, args.only, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            print(compare(report, json.load(f)).round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from dataset import normalize
+from partial_stats import value_counts
+from schema import LABEL_FIXES
+
+REFERENCE_PATH = "data/airline2.csv"
+
+ARRIVAL, DEPARTURE = "Arrival Delay In Minutes", "Departure Delay In Minutes"
+
+
+class SurveyModel:
+    """Distribution of every column given Satisfaction, fitted on a real file.
+
+    Sampling each column conditionally on Satisfaction keeps the marginals of
+    the reference data and the association of every question with the target,
+    which is what the correlation and test code depends on.
+    """
+
+    def __init__(self, columns, raw_columns, categories, distributions, delays):
+        self.columns = columns
+        self.raw_columns = raw_columns
+        self.categories = categories
+        self.distributions = distributions
+        self.delays = delays
+
+    @classmethod
+    def fit(cls, path=REFERENCE_PATH):
+        raw = pd.read_csv(path)
+        df = normalize(raw.copy())
+        raw_columns = {col.title(): col for col in raw.columns}
+
+        categories = {
+            col: df[col].cat.categories
+            for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+        }
+        # Categoricals are sampled as codes
+        codes = df.assign(**{col: df[col].cat.codes for col in categories})
+        groups = [codes[codes["Satisfaction"] == level] for level in (0, 1)]
+
+        distributions = {}
+        for col in df.columns:
+            if col in ("Satisfaction", ARRIVAL):
+                continue
+            distributions[col] = []
+            for group in groups:
+                values, counts = value_counts(group[col])
+                distributions[col].append((values, counts / counts.sum()))
+        _, counts = value_counts(codes["Satisfaction"])
+        distributions["Satisfaction"] = (np.arange(len(counts)), counts / counts.sum())
+
+        # Arrival delay = departure delay + an offset seen in the data, with
+        # the share of missing values of the reference file
+        offsets, counts = value_counts((df[ARRIVAL] - df[DEPARTURE]).dropna())
+        delays = (offsets, counts / counts.sum(), df[ARRIVAL].isna().mean())
+
+        return cls(list(df.columns), raw_columns, categories, distributions, delays)
+
+    def sample(self, rows, seed=0):
+        """Frame of `rows` passengers with the dtypes of load_dataset()."""
+        rng = np.random.default_rng(seed)
+        levels, p = self.distributions["Satisfaction"]
+        satisfaction = rng.choice(levels, size=rows, p=p).astype(np.int8)
+
+        columns = {"Satisfaction": satisfaction}
+        for col, per_level in self.distributions.items():
+            if col == "Satisfaction":
+                continue
+            out = np.empty(rows, dtype=per_level[0][0].dtype)
+            for level, (values, level_p) in enumerate(per_level):
+                in_level = satisfaction == level
+                out[in_level] = rng.choice(values, size=in_level.sum(), p=level_p)
+            columns[col] = out
+
+        offsets, offset_p, missing = self.delays
+        arrival = columns[DEPARTURE] + rng.choice(offsets, size=rows, p=offset_p)
+        arrival = np.maximum(arrival, 0).astype(np.float64)
+        arrival[rng.random(rows) < missing] = np.nan
+        columns[ARRIVAL] = arrival
+
+        for col, categories in self.categories.items():
+            columns[col] = pd.Categorical.from_codes(columns[col], categories)
+        return pd.DataFrame(columns)[self.columns]
+
+    def to_raw(self, df):
+        """The same rows with the headers and labels of the raw survey files,
+        to be written with to_csv() like data/airline2.csv."""
+        raw = df.copy()
+        for col, fixes in LABEL_FIXES.items():
+            original = {fixed: value for value, fixed in fixes.items()}
+            raw[col] = raw[col].cat.rename_categories(
+                [original.get(value, value) for value in raw[col].cat.categories]
+            )
+        raw.insert(0, "Id", np.arange(1, len(raw) + 1))
+        return raw.rename(columns=self.raw_columns)
+
+
+def generate(rows, seed=0, reference=REFERENCE_PATH):
+    return SurveyModel.fit(reference).sample(rows, seed)
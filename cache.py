@@ -0,0 +1,220 @@
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+import pandas as pd
+
+from dataset import CACHE_DIR, _write_atomic, build_lock, frame_fingerprint
+from schema import SCHEMA_VERSION
+
+
+def path_fingerprint(path):
+    # Cheap check that needs no read: path, modification time and size
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def fingerprint(value):
+    """Cache key part for a dataset: a DataFrame or the path of a data file."""
+    if isinstance(value, pd.DataFrame):
+        return frame_fingerprint(value)
+    return path_fingerprint(value)
+
+
+# Referenced by many values, owned by none of them
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType)
+
+
+def estimate_size(value, _seen=None):
+    """Approximate bytes held by `value`, following containers and object
+    attributes (e.g. the arrays inside a BitmapIndex or a model)."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen or isinstance(value, _SHARED_TYPES):
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        size = value.memory_usage(deep=True)
+        return int(size.sum() if isinstance(value, pd.DataFrame) else size)
+    if isinstance(getattr(value, "nbytes", None), int):
+        # Arrays, Arrow data and objects that report their own size
+        return value.nbytes
+    if hasattr(value, "to_plotly_json"):
+        return estimate_size(value.to_plotly_json(), seen)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(key, seen) + estimate_size(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), seen)
+    return size
+
+
+class FingerprintCache:
+    """LRU cache bounded in bytes, with optional TTL and on-disk copies.
+
+    Keys start with the dataset fingerprint, so everything derived from one
+    version of the data can be dropped at once with invalidate(). Entries
+    written to `persist_dir` are shared by every process using that directory,
+    which is kept under `max_disk_bytes` by evicting the least recently used.
+    """
+
+    def __init__(
+        self, max_bytes=512 * 2**20, ttl=None, persist_dir=None, max_disk_bytes=None
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.persist_dir, f"{key}.pkl")
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[1]):
+                self._entries.move_to_end(key)
+                return entry[0]
+            if entry is not None:
+                self._drop(key)
+
+        if self.persist_dir:
+            path = self._path(key)
+            try:
+                created = os.path.getmtime(path)
+                if not self._expired(created):
+                    with open(path, "rb") as f:
+                        value = pickle.load(f)
+                    # The access time records the last use, the mtime the creation
+                    os.utime(path, (time.time(), created))
+                    self.set(key, value, persist=False, created=created)
+                    return value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        return default
+
+    def set(self, key, value, persist=False, created=None):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (value, created or time.time(), size)
+                self._bytes += size
+                # Evict least recently used entries past the byte budget
+                while self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+
+        if persist and self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+            def write(tmp_path):
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            _write_atomic(self._path(key), write)
+            self._evict_disk()
+
+    def _evict_disk(self):
+        if self.max_disk_bytes is None:
+            return
+        entries = []
+        for name in os.listdir(self.persist_dir):
+            if name.endswith(".pkl"):
+                try:
+                    stat = os.stat(os.path.join(self.persist_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.persist_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, fingerprint=None):
+        """Drop every entry, or only those derived from one dataset fingerprint."""
+        prefix = "" if fingerprint is None else f"{fingerprint}-"
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._drop(key)
+        if self.persist_dir and os.path.isdir(self.persist_dir):
+            for name in os.listdir(self.persist_dir):
+                if name.startswith(prefix) and name.endswith(".pkl"):
+                    try:
+                        os.remove(os.path.join(self.persist_dir, name))
+                    except OSError:
+                        pass
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+CACHE = FingerprintCache(
+    max_bytes=int(os.environ.get("APP_CACHE_MAX_MB", 512)) * 2**20,
+    ttl=float(os.environ["APP_CACHE_TTL"]) if "APP_CACHE_TTL" in os.environ else None,
+    persist_dir=os.environ.get("APP_CACHE_DIR", os.path.join(CACHE_DIR, "results")),
+    max_disk_bytes=int(os.environ.get("APP_CACHE_MAX_DISK_MB", 1024)) * 2**20,
+)
+
+
+def memoize(persist=False, cache=None):
+    """Cache `func(data, *args)` on the fingerprint of `data` and `args`,
+    instead of hashing the whole frame on every call.
+
+    With persist=True only results on the full dataset are written to disk;
+    those on a filtered subset (see filters.filter_frame) stay in memory.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(data, *args):
+            target = CACHE if cache is None else cache
+            # Results computed on data normalized by an older schema are stale
+            call = repr((SCHEMA_VERSION, func.__module__, func.__qualname__, args))
+            key = f"{fingerprint(data)}-{hashlib.sha1(call.encode()).hexdigest()}"
+            missing = object()
+            value = target.get(key, missing)
+            if value is missing:
+                # A caller already computing this key (e.g. the warmup thread)
+                # finishes first; the others wait for its result
+                with build_lock(key):
+                    value = target.get(key, missing)
+                    if value is missing:
+                        value = func(data, *args)
+                        selection = getattr(data, "attrs", {}).get("selection")
+                        target.set(key, value, persist=persist and not selection)
+            return value
+
+        return wrapper
+
+    return decorator
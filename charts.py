@@ -0,0 +1,465 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from aggregates import category_counts, histogram_counts, rating_pivot
+from schema import RATING_COLUMNS
+
+
+def set_font_size(fig, size=36):
+    fig.update_layout(
+        font=dict(
+            size=size,
+        ),
+        title_font=dict(
+            size=size,
+        ),
+        legend=dict(
+            font=dict(
+                size=size,
+            )
+        ),
+        xaxis=dict(
+            title_font=dict(
+                size=size,
+            ),
+            tickfont=dict(
+                size=size,
+            ),
+        ),
+        yaxis=dict(
+            title_font=dict(
+                size=size,
+            ),
+            tickfont=dict(
+                size=size,
+            ),
+        ),
+    )
+    return fig
+
+
+def heatmap_figure(pivot_table, title_text):
+    fig = px.imshow(
+        pivot_table,
+        labels=dict(x="Rating", y="Servicio", color="Pasajeros"),
+        x=[str(i) for i in range(0, 6)],
+        aspect="auto",
+        title=title_text,
+        color_continuous_scale="Viridis",
+    )
+
+    values = pivot_table.to_numpy()
+    # Highlight the maximum of each rating column (all of them on ties)
+    is_max = values == values.max(axis=0)
+    rows, cols = np.indices(values.shape)
+
+    annotations = [
+        dict(
+            x=x,
+            y=y,
+            text="{:,}".format(int(value)).replace(",", "."),
+            showarrow=False,
+            font=dict(
+                color="red" if highlight else "white",
+                weight="bold" if highlight else "normal",
+            ),
+        )
+        for x, y, value, highlight in zip(
+            cols.ravel(), rows.ravel(), values.ravel(), is_max.ravel()
+        )
+    ]
+    # Red border around the maximum cells, transparent fill
+    shapes = [
+        dict(
+            type="rect",
+            x0=x - 0.5,
+            y0=y - 0.5,
+            x1=x + 0.5,
+            y1=y + 0.5,
+            line=dict(color="red", width=2),
+            fillcolor="rgba(0,0,0,0)",
+        )
+        for y, x in zip(*np.nonzero(is_max))
+    ]
+
+    # Everything goes in with a single layout update
+    fig.update_layout(
+        title_text=title_text,
+        title_x=0.5,
+        title_font=dict(size=24),
+        xaxis=dict(tickfont=dict(size=12)),
+        yaxis=dict(tickfont=dict(size=12), title=""),
+        autosize=False,
+        width=1000,
+        height=800,
+        coloraxis_colorbar=dict(
+            title="Pasajeros",
+            titleside="right",
+            titlefont=dict(size=12),
+            tickfont=dict(size=10),
+        ),
+        annotations=annotations,
+        shapes=shapes,
+    )
+
+    return set_font_size(fig, 30)
+
+
+def picker_figure(aggregate, column, plot_type, color_sequences):
+    if plot_type == "Histograma":
+        fig = px.bar(
+            aggregate,
+            x="Value",
+            y="Count",
+            color="Value",
+            color_discrete_sequence=color_sequences,
+            labels={"Value": column, "Count": "count"},
+        )
+    elif plot_type == "Linea":
+        positions, values = aggregate
+        fig = px.line(
+            x=values,
+            y=positions,
+            labels={"x": column, "y": "index"},
+            template="plotly_dark",
+        )
+    elif plot_type == "Box Plot":
+        fig = go.Figure(
+            go.Box(
+                y0=column,
+                q1=[aggregate["q1"]],
+                median=[aggregate["median"]],
+                q3=[aggregate["q3"]],
+                lowerfence=[aggregate["lowerfence"]],
+                upperfence=[aggregate["upperfence"]],
+                mean=[aggregate["mean"]],
+                orientation="h",
+                name=column,
+                boxpoints=False,
+            ),
+            layout=dict(template="plotly_dark", xaxis_title=column),
+        )
+        fig.add_scatter(
+            x=aggregate["outliers"],
+            y=[column] * len(aggregate["outliers"]),
+            mode="markers",
+            showlegend=False,
+        )
+    return fig
+
+
+def travel_type_figure(cube):
+    # Read the counts from the precomputed cube
+    counts = category_counts(cube, "Type Of Travel")
+
+    # Convert the counts to a DataFrame
+    df_counts = pd.DataFrame({"Type Of Travel": counts.index, "Count": counts.values})
+
+    # Create a bar chart for 'Type Of Travel' using Plotly
+    fig = px.bar(
+        data_frame=df_counts,
+        x="Type Of Travel",
+        y="Count",
+        color="Type Of Travel",
+        color_discrete_map={
+            "Personal Travel": "SandyBrown",  # Vibrant orange for personal travel
+            "Business Travel": "#34495E",  # Navy blue for business travel
+        },
+        # As strings, so the labels survive a JSON round trip (report.py)
+        text=df_counts["Count"].astype(str),
+        title="Total de pasajeros por Tipo de Viaje",
+        labels={
+            "Type Of Travel": "Tipo de Viaje",
+            "Count": "Pasajeros",
+        },
+    )
+
+    fig.update_traces(textposition="auto", textfont_color="white")
+    fig = set_font_size(fig)
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def gender_figure(cube):
+    # Get counts of each gender
+    gender_counts = category_counts(cube, "Gender")
+
+    # Create a pie chart
+    fig = px.pie(
+        gender_counts,
+        values=gender_counts.values,
+        names=gender_counts.index,
+        color=gender_counts.index,
+        color_discrete_map={"Female": "Orchid", "Male": "CornflowerBlue"},
+        title="Distribución de género de los pasajeros",
+    )
+
+    fig.update_traces(textinfo="percent+value", textfont_color="white")
+    fig.update_layout(legend_title_text="Género", separators=",.")
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def satisfaction_figure(cube):
+    fig = (
+        category_counts(cube, "Satisfaction")
+        .rename("count")
+        .rename_axis("Satisfaction")
+        .reset_index()
+        .rename(columns={"Satisfaction": "Satisfaction", "count": "Count"})
+        .pipe(
+            px.pie,
+            names="Satisfaction",
+            values="Count",
+            color="Satisfaction",
+            color_discrete_map={
+                "Neutral or Dissatisfied": "Crimson",
+                "Satisfied": "Chartreuse",
+            },
+            title="Distribución de satisfacción de los pasajeros",
+            labels={
+                "Satisfaction": "Nivel de Satisfacción",
+                "Count": "Pasajeros",
+            },
+        )
+        .update_traces(
+            textposition="inside",
+            textinfo="percent+value",
+            textfont_color="white",
+        )
+    )
+
+    fig.update_layout(legend_title_text="Nivel de Satisfacción", separators=",.")
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def distance_figure(cube):
+    # Pre-binned server side: bins of 100 km, up to the longest flight
+    bins = histogram_counts(cube, "distance")
+    fig = px.bar(
+        x=(bins["Start"] + bins["End"]) / 2,
+        y=bins["Count"],
+        title="Distribución de Distancia de Vuelo",
+        color_discrete_sequence=["#636EFA"],
+        template="plotly_dark",
+    )
+
+    fig.update_traces(
+        width=bins["End"] - bins["Start"],
+        textposition="inside",
+        texttemplate="%{y}",
+        textfont_size=28,
+    )
+
+    fig.update_layout(
+        xaxis_title_text="Distancia de Vuelo (km)",
+        yaxis_title_text="Vuelos",
+        bargap=0.2,
+        bargroupgap=0.1,
+    )
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def age_figure(cube):
+    # Pre-binned server side: bins of 10 years, up to the oldest passenger
+    bins = histogram_counts(cube, "age")
+    fig = px.bar(
+        x=(bins["Start"] + bins["End"]) / 2,
+        y=bins["Count"],
+        title="Distribución de Edad",
+        color_discrete_sequence=["#636EFA"],
+        template="plotly_dark",
+        range_x=[0, max(90, bins["End"].max())],
+    )
+
+    fig.update_traces(
+        width=bins["End"] - bins["Start"],
+        textposition="inside",
+        texttemplate="%{y}",
+        textfont_size=28,
+    )
+
+    fig.update_layout(
+        xaxis_title_text="Edad",
+        yaxis_title_text="Pasajeros",
+        bargap=0.2,
+        bargroupgap=0.1,
+    )
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def class_figure(cube):
+    class_counts = category_counts(cube, "Class")
+
+    fig = px.pie(
+        class_counts,
+        values=class_counts.values,
+        names=class_counts.index,
+        color=class_counts.index,
+        color_discrete_map={
+            "Business": "LightBlue",
+            "Eco": "DarkSeaGreen",
+            "Eco Plus": "GreenYellow",
+        },
+        title="Distribución de clase de los pasajeros",
+    )
+
+    fig.update_traces(textinfo="percent+value", textfont_color="white")
+    fig.update_layout(legend_title_text="Clase", separators=",.")
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def customer_type_figure(cube):
+    customer_counts = category_counts(cube, "Customer Type")
+
+    fig = px.pie(
+        customer_counts,
+        values=customer_counts.values,
+        names=customer_counts.index,
+        color=customer_counts.index,
+        color_discrete_map={
+            "Loyal Customer": "LightGreen",
+            "Disloyal Customer": "LightCoral",
+        },
+        title="Distribución de tipo de cliente",
+    )
+
+    fig.update_traces(textinfo="percent+value", textfont_color="white")
+    fig.update_layout(legend_title_text="Tipo de cliente", separators=",.")
+
+    fig = set_font_size(fig)
+    return fig
+
+
+def gate_location_figure(cube):
+    gate_counts = rating_pivot(cube).loc["Gate Location"]
+    fig = px.bar(
+        x=gate_counts.index,
+        y=gate_counts.values,
+        title="Distribución de Satisfacción de Ubicación de Puerta",
+        labels={"x": "Nivel de Satisfacción"},
+        color_discrete_sequence=["#636EFA"],
+    )
+    fig.update_layout(
+        xaxis_title_text="Nivel de Satisfacción",
+        yaxis_title_text="Frecuencia",
+        xaxis=dict(
+            tickmode="array",
+            tickvals=[1, 2, 3, 4, 5],
+            ticktext=["1", "2", "3", "4", "5"],
+            range=[
+                0.5,
+                5.5,
+            ],  # Sets the range of the x-axis to start from 1 and end at 5
+        ),
+        bargap=0.2,  # Adjusts the gap between bars
+    )
+
+    fig.update_traces(textposition="inside", texttemplate="%{y}", textfont_size=28)
+    fig = set_font_size(fig)
+    return fig
+
+
+def services_heatmap_figure(cube):
+    # Service x Rating counts straight from the cube
+    pivot_table = rating_pivot(cube)
+
+    fig = heatmap_figure(pivot_table, "Satisfacción de los pasajeros por servicio")
+    return fig
+
+
+def satisfaction_heatmap_figure(cube, satisfaction_level):
+    # Counts for the satisfaction level, already split in the cube
+    pivot_table = rating_pivot(cube, satisfaction_level)
+
+    return heatmap_figure(
+        pivot_table,
+        f"Satisfacción de los pasajeros por servicio <br>{satisfaction_level}",
+    )
+
+
+def service_averages(cube):
+    # Step 1: Take the rating counts of each service from the cube
+    rating_counts = rating_pivot(cube).loc[RATING_COLUMNS]
+
+    # Step 2: Calculate the average for each service from its counts
+    averages = (rating_counts * rating_counts.columns).sum(axis=1) / rating_counts.sum(
+        axis=1
+    )
+
+    # Step 3: Convert these averages into a format suitable for plotting
+    return pd.DataFrame({"Service": averages.index, "Average Rating": averages.values})
+
+
+# The figures of display_charts in page order: (page column, name, builder)
+CHARTS = [
+    (0, "Tipo de viaje", travel_type_figure),
+    (1, "Género", gender_figure),
+    (2, "Satisfacción", satisfaction_figure),
+    (0, "Distancia de vuelo", distance_figure),
+    (1, "Edad", age_figure),
+    (2, "Clase", class_figure),
+    (0, "Tipo de cliente", customer_type_figure),
+    (1, "Ubicación de puerta", gate_location_figure),
+    (2, "Mapa de calor", services_heatmap_figure),
+    # The 'Satisfaction' column has two unique values
+    (
+        0,
+        "Mapa de calor: Neutral or Dissatisfied",
+        functools.partial(
+            satisfaction_heatmap_figure, satisfaction_level="Neutral or Dissatisfied"
+        ),
+    ),
+    (
+        0,
+        "Mapa de calor: Satisfied",
+        functools.partial(satisfaction_heatmap_figure, satisfaction_level="Satisfied"),
+    ),
+]
+
+
+def importance_figure(importance):
+    fig = px.bar(
+        importance.sort_values("importance"),
+        x="importance",
+        y="feature",
+        orientation="h",
+        title="Importancia de cada variable en el modelo",
+        labels={"importance": "Importancia (log-odds)", "feature": ""},
+        color_discrete_sequence=["#636EFA"],
+    )
+    fig.update_layout(height=800)
+    return set_font_size(fig, 24)
+
+
+def delay_histogram_figure(histogram, column, by):
+    # Log bins (1-2, 2-4, 4-8, ... minutes), as a share of each group's
+    # delayed passengers so groups of different size compare
+    labels = [
+        f"{start:,.0f}-{end:,.0f}"
+        for start, end in zip(histogram["Start"], histogram["End"])
+    ]
+    fig = px.bar(
+        histogram.assign(Minutos=labels),
+        x="Minutos",
+        y="Share",
+        color=by,
+        barmode="group",
+        title=f"{column}: pasajeros con retraso por rango (escala logarítmica)",
+        labels={"Share": "Proporción de pasajeros con retraso"},
+    )
+    fig.update_layout(yaxis_tickformat=".0%")
+    return set_font_size(fig, 24)
@@ -0,0 +1,174 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+SEGMENT_COLUMNS = ["Class", "Type Of Travel", "Customer Type"]
+
+RESULT_COLUMNS = [
+    "correlation_spearman",
+    "p-value_spearman",
+    "correlation_biserial",
+    "p-value_biserial",
+    "correlation_kendall",
+    "p-value_kendall",
+]
+
+
+def encode_target(series, positive="Satisfied"):
+    # The merged data has labels, airline_correlation2.csv already has 0/1
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    encoded = (series == positive).to_numpy(dtype=np.float64)
+    encoded[series.isna().to_numpy()] = np.nan
+    return encoded
+
+
+def _pearson(X, y):
+    """Pearson r and two-sided p-value of every column of X against y."""
+    n = len(y)
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (Xc.T @ yc) / (np.sqrt((Xc * Xc).sum(axis=0)) * np.sqrt(yc @ yc))
+        r = np.clip(r, -1.0, 1.0)
+        t = r * np.sqrt((n - 2) / ((1.0 - r) * (1.0 + r)))
+    return r, 2 * stats.t.sf(np.abs(t), n - 2)
+
+
+def _tie_sums(totals):
+    totals = totals.astype(np.float64)
+    return (
+        (totals * (totals - 1) / 2).sum(),
+        (totals * (totals - 1) * (totals - 2)).sum(),
+        (totals * (totals - 1) * (2 * totals + 5)).sum(),
+    )
+
+
+def _kendall_from_table(table):
+    """Kendall tau-b and asymptotic p-value from an x-level by y-level table,
+    using the same tie-corrected variance as scipy.stats.kendalltau."""
+    table = table.astype(np.float64)
+    n = table.sum()
+    # Pairs strictly above-right / above-left of every cell
+    above = np.cumsum(table[::-1], axis=0)[::-1]
+    above = np.vstack([above[1:], np.zeros((1, table.shape[1]))])
+    right = np.cumsum(above[:, ::-1], axis=1)[:, ::-1]
+    right = np.hstack([right[:, 1:], np.zeros((table.shape[0], 1))])
+    left = np.cumsum(above, axis=1)
+    left = np.hstack([np.zeros((table.shape[0], 1)), left[:, :-1]])
+    con_minus_dis = (table * (right - left)).sum()
+
+    xtie, x0, x1 = _tie_sums(table.sum(axis=1))
+    ytie, y0, y1 = _tie_sums(table.sum(axis=0))
+    tot = n * (n - 1) / 2
+    if xtie == tot or ytie == tot:
+        return np.nan, np.nan
+    tau = con_minus_dis / np.sqrt(tot - xtie) / np.sqrt(tot - ytie)
+
+    m = n * (n - 1)
+    var = (
+        (m * (2 * n + 5) - x1 - y1) / 18
+        + (2 * xtie * ytie) / m
+        + x0 * y0 / (9 * m * (n - 2))
+    )
+    return tau, 2 * stats.norm.sf(abs(con_minus_dis) / np.sqrt(var))
+
+
+def _kendall(x, y):
+    x_levels, x_codes = np.unique(x, return_inverse=True)
+    y_levels, y_codes = np.unique(y, return_inverse=True)
+    table = np.bincount(
+        x_codes * len(y_levels) + y_codes, minlength=len(x_levels) * len(y_levels)
+    ).reshape(len(x_levels), len(y_levels))
+    return _kendall_from_table(table)
+
+
+def _correlate_block(X, y):
+    # Ranks of the whole block and of the target are computed once
+    spearman, spearman_p = _pearson(stats.rankdata(X, axis=0), stats.rankdata(y))
+    biserial, biserial_p = _pearson(X, y)
+    kendall = np.array([_kendall(X[:, j], y) for j in range(X.shape[1])])
+    return np.column_stack(
+        [spearman, spearman_p, biserial, biserial_p, kendall[:, 0], kendall[:, 1]]
+    )
+
+
+def correlations(df, target="Satisfaction", columns=None, positive="Satisfied"):
+    """Spearman, point-biserial and Kendall coefficients of every column
+    against the (binary) target, with p-values."""
+    if columns is None:
+        columns = [
+            col
+            for col in df.columns
+            if col != target and pd.api.types.is_numeric_dtype(df[col].dtype)
+        ]
+    y = encode_target(df[target], positive)
+    X = np.column_stack(
+        [df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in columns]
+    )
+
+    results = np.full((len(columns), len(RESULT_COLUMNS)), np.nan)
+    complete = ~np.isnan(X).any(axis=0)
+    valid_y = ~np.isnan(y)
+    if complete.any():
+        results[complete] = _correlate_block(X[valid_y][:, complete], y[valid_y])
+    # Columns with nulls use their own complete rows
+    for j in np.flatnonzero(~complete):
+        rows = valid_y & ~np.isnan(X[:, j])
+        results[j] = _correlate_block(X[rows, j : j + 1], y[rows])[0]
+
+    return pd.DataFrame(results, index=pd.Index(columns), columns=RESULT_COLUMNS)
+
+
+def correlations_by_segment(df, by=SEGMENT_COLUMNS, **kwargs):
+    """One correlations() table per combination of the `by` columns."""
+    tables = []
+    for key, segment in df.groupby(by, observed=True):
+        table = correlations(segment, **kwargs)
+        for position, (col, value) in enumerate(zip(by, key)):
+            table.insert(position, col, value)
+        tables.append(table)
+    return pd.concat(tables)
+
+
+def write_artifacts(result, json_path=None, csv_path=None):
+    # Same layout as data/airline_correlation2.json: {question: {metric: value}};
+    # segmented results repeat questions, so they are written as records
+    if json_path and result.index.is_unique:
+        result.to_json(json_path, orient="index")
+    elif json_path:
+        result.rename_axis("question").reset_index().to_json(
+            json_path, orient="records"
+        )
+    if csv_path:
+        result.to_csv(csv_path, index_label="question")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Correlaciones de cada pregunta con la satisfacción"
+    )
+    parser.add_argument("path", nargs="?", default="data/airline_correlation2.csv")
+    parser.add_argument("--target", default="satisfaction")
+    parser.add_argument("--positive", default="Satisfied")
+    parser.add_argument("--by", nargs="*", help="Columnas de segmentación")
+    parser.add_argument("--json")
+    parser.add_argument("--csv")
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.path)
+    if args.by:
+        result = correlations_by_segment(
+            data, by=args.by, target=args.target, positive=args.positive
+        )
+    else:
+        result = correlations(data, target=args.target, positive=args.positive)
+
+    write_artifacts(result, args.json, args.csv)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from schema import CATEGORICAL_COLUMNS, SCHEMA_VERSION, validate
+
+DATA_PATH = os.path.join("data", "airline_merged_clean.csv")
+CACHE_DIR = os.path.join("data", ".cache")
+PARTITIONS_DIR = os.path.join("data", "partitions")
+MANIFEST = "manifest.json"
+
+# Bump when the layout of the cached copies changes, so old ones are rebuilt
+CACHE_VERSION = 2
+
+
+def normalize(df):
+    """Clean survey frame: headers, labels and types fixed by schema.py, and
+    the rows that break the schema dropped (see schema.validate)."""
+    return validate(df)[0]
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_fingerprint(sha256):
+    # Data normalized by another schema version is another dataset
+    return hashlib.sha256(f"{sha256}:{SCHEMA_VERSION}".encode()).hexdigest()[:16]
+
+
+def _cache_stem(path):
+    # Files with the same name in different directories get their own slot
+    stem = os.path.splitext(os.path.basename(path))[0]
+    source = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]
+    return f"{stem}.{source}"
+
+
+def _cache_paths(path, cache_dir):
+    stem = _cache_stem(path)
+    return (
+        os.path.join(cache_dir, f"{stem}.parquet"),
+        os.path.join(cache_dir, f"{stem}.json"),
+    )
+
+
+def _rejected_path(path, cache_dir):
+    return os.path.join(cache_dir, f"{_cache_stem(path)}.rejected.csv")
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+_BUILD_LOCKS = weakref.WeakValueDictionary()
+_BUILD_LOCKS_GUARD = threading.Lock()
+
+
+def build_lock(key):
+    """Lock shared by the threads of this process that build `key`, so a
+    cached file or value is built once and the others wait for it."""
+    with _BUILD_LOCKS_GUARD:
+        lock = _BUILD_LOCKS.get(key)
+        if lock is None:
+            lock = _BUILD_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _write_atomic(path, write):
+    # Several Streamlit workers and threads may rebuild at once; each writes
+    # its own temporary file and none ever exposes a partial one
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp",
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    _write_atomic(meta_path, write)
+
+
+def build_cache(path, cache_dir=CACHE_DIR):
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stat = os.stat(path)
+    sha256 = file_hash(path)
+    df, rejected = validate(pd.read_csv(path))
+    # Stored in the Parquet file itself, so its rows and fingerprint always
+    # travel together
+    df.attrs["fingerprint"] = _file_fingerprint(sha256)
+    _write_atomic(parquet_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    # Rows that break the schema are kept aside for inspection
+    rejected_path = _rejected_path(path, cache_dir)
+    if len(rejected):
+        _write_atomic(rejected_path, lambda tmp_path: rejected.to_csv(tmp_path))
+    elif os.path.exists(rejected_path):
+        os.remove(rejected_path)
+
+    meta = {
+        "source": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256,
+        "fingerprint": df.attrs["fingerprint"],
+        "rejected": len(rejected),
+        "version": CACHE_VERSION,
+        "schema_version": SCHEMA_VERSION,
+    }
+    _write_meta(meta_path, meta)
+    return df, meta
+
+
+def ensure_cache(path, cache_dir=CACHE_DIR):
+    """Return the cache metadata for `path`, rebuilding the Parquet copy if stale."""
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    with build_lock(os.path.abspath(parquet_path)):
+        return _ensure_cache(path, cache_dir, parquet_path, meta_path)
+
+
+def _ensure_cache(path, cache_dir, parquet_path, meta_path):
+    meta = _read_meta(meta_path)
+    stat = os.stat(path)
+
+    if (
+        meta is None
+        or meta.get("version") != CACHE_VERSION
+        or meta.get("schema_version") != SCHEMA_VERSION
+        or meta.get("source") != os.path.abspath(path)
+        or not os.path.exists(parquet_path)
+    ):
+        return build_cache(path, cache_dir)[1]
+
+    if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+        return meta
+
+    # The file was touched; only rebuild if the content actually changed
+    if meta["size"] == stat.st_size and meta["sha256"] == file_hash(path):
+        meta.update(mtime_ns=stat.st_mtime_ns)
+        _write_meta(meta_path, meta)
+        return meta
+
+    return build_cache(path, cache_dir)[1]
+
+
+def read_manifest(directory):
+    """Ingested batches of a partition directory (see ingest.py)."""
+    meta = _read_meta(os.path.join(directory, MANIFEST))
+    return meta if meta is not None else {"batches": []}
+
+
+def manifest_fingerprint(manifest):
+    # Partitions are never rewritten, so the hashes of the ingested source
+    # files identify the dataset
+    digest = hashlib.sha256()
+    for batch in manifest["batches"]:
+        digest.update(batch["sha256"].encode())
+    return digest.hexdigest()[:16]
+
+
+def load_partitions(directory):
+    """Concatenate the Parquet partitions written by ingest.py."""
+    manifest = read_manifest(directory)
+    frames = [
+        pd.read_parquet(os.path.join(directory, partition["file"]))
+        for batch in manifest["batches"]
+        for partition in batch["partitions"]
+    ]
+    if not frames:
+        raise FileNotFoundError(f"No hay particiones en {directory}")
+
+    # Each partition has its own categories; align them so concat keeps
+    # the columns categorical
+    for col in CATEGORICAL_COLUMNS:
+        if col in frames[0].columns:
+            categories = pd.Index(
+                pd.unique(np.concatenate([f[col].cat.categories for f in frames]))
+            )
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+
+    df = pd.concat(frames, ignore_index=True)
+    df.attrs["fingerprint"] = manifest_fingerprint(manifest)
+    return df
+
+
+def load_dataset(path, cache_dir=CACHE_DIR):
+    """Load a survey CSV through its typed Parquet cache, or a directory of
+    partitions written by ingest.py."""
+    if os.path.isdir(path):
+        return load_partitions(path)
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    with build_lock(os.path.abspath(parquet_path)):
+        meta = _ensure_cache(path, cache_dir, parquet_path, meta_path)
+        df = pd.read_parquet(parquet_path)
+    # Another process may have rebuilt the copy since the check; the
+    # fingerprint stored in the file is the one of the rows just read
+    df.attrs.setdefault("fingerprint", meta["fingerprint"])
+    return df
+
+
+def _arrow_column(series):
+    import pyarrow as pa
+
+    # Keep NaN as values rather than Arrow nulls: a column without a
+    # validity bitmap converts back to pandas without a copy
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return pa.DictionaryArray.from_arrays(
+            pa.array(codes, mask=codes < 0),
+            pa.array(series.cat.categories.to_numpy(dtype=object)),
+        )
+    return pa.array(series.to_numpy())
+
+
+def write_arrow(df, path):
+    """Uncompressed Arrow IPC (Feather v2) copy of `df`, for memory mapping."""
+    # pyarrow is only imported by the Arrow copy, not by every user of dataset
+    import pyarrow as pa
+
+    table = pa.table(
+        [_arrow_column(df[col]) for col in df.columns], names=list(df.columns)
+    )
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def load_shared(path, cache_dir=CACHE_DIR):
+    """Same frame as load_dataset, backed by a memory-mapped Arrow file.
+
+    Numeric columns and category codes are read-only views on the mapping,
+    so every process that loads the same version of the data shares one
+    copy in the OS page cache instead of holding its own.
+    """
+    if os.path.isdir(path):
+        fingerprint = manifest_fingerprint(read_manifest(path))
+    else:
+        fingerprint = ensure_cache(path, cache_dir)["fingerprint"]
+
+    stem = _cache_stem(os.path.normpath(path))
+    arrow_path = os.path.join(cache_dir, f"{stem}-{fingerprint}.arrow")
+    # Only older copies of this same source, never another dataset's
+    versions = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{16}}\.arrow")
+    with build_lock(os.path.abspath(arrow_path)):
+        if not os.path.exists(arrow_path):
+            os.makedirs(cache_dir, exist_ok=True)
+            df = load_dataset(path, cache_dir)
+            _write_atomic(arrow_path, lambda tmp_path: write_arrow(df, tmp_path))
+            # Older versions stay readable by processes that still map them
+            for name in os.listdir(cache_dir):
+                if versions.fullmatch(name):
+                    if name != os.path.basename(arrow_path):
+                        try:
+                            os.remove(os.path.join(cache_dir, name))
+                        except OSError:
+                            pass
+
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(arrow_path)).read_all()
+    df = table.to_pandas(split_blocks=True)
+    df.attrs["fingerprint"] = fingerprint
+    return df
+
+
+def frame_fingerprint(df):
+    """Short id for the data in `df`: the cache hash when loaded via load_dataset."""
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is None:
+        hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest = hashlib.sha256(hashed.tobytes())
+        digest.update(",".join(map(str, df.columns)).encode())
+        fingerprint = digest.hexdigest()[:16]
+    return fingerprint
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import _codes
+
+DELAY_COLUMNS = ["Departure Delay In Minutes", "Arrival Delay In Minutes"]
+
+# Grouping columns of the delay panel; the distance band is derived from
+# Flight Distance
+DISTANCE_BAND = "Distance Band"
+DELAY_GROUPS = ["Class", "Type Of Travel", DISTANCE_BAND, "Satisfaction"]
+DISTANCE_BANDS = np.array([0, 500, 1000, 2000, 3000, np.inf])
+
+PERCENTILES = [0.5, 0.9, 0.99, 0.999]
+ON_TIME_MINUTES = 15
+
+# Bin 0 is [0, 1) minutes (no delay); past that, 8 log bins per doubling up
+# to 2**12 minutes, so a percentile read off the bins is within 9% of the
+# exact value. Longer delays fall in the last bin
+BINS_PER_OCTAVE = 8
+DELAY_EDGES = np.concatenate(
+    [[0.0], 2.0 ** (np.arange(12 * BINS_PER_OCTAVE + 1) / BINS_PER_OCTAVE)]
+)
+
+
+def distance_bands(series):
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    bands = np.searchsorted(DISTANCE_BANDS, values, side="right") - 1
+    labels = [
+        f"{low:,.0f}-{high:,.0f}" if np.isfinite(high) else f"{low:,.0f}+"
+        for low, high in zip(DISTANCE_BANDS[:-1], DISTANCE_BANDS[1:])
+    ]
+    bands[np.isnan(values) | (bands < 0)] = -1
+    return bands.astype(np.int64), pd.Index(labels)
+
+
+def _group_codes(df, by):
+    if by == DISTANCE_BAND:
+        return distance_bands(df["Flight Distance"])
+    return _codes(df[by])
+
+
+def delay_counts(df, column, by):
+    """Per-group log-binned histogram of `column`, with on-time, null and
+    maximum per group, in one pass and without sorting.
+
+    Returns (groups, counts, on_time, nulls, maxima); counts is groups x
+    bins. Every part adds up (or takes the max) across chunks of the data.
+    """
+    group_codes, groups = _group_codes(df, by)
+    n_groups, n_bins = len(groups), len(DELAY_EDGES) - 1
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    known = group_codes >= 0
+    present = known & ~np.isnan(values)
+    codes, delays = group_codes[present], values[present]
+    bins = np.clip(
+        np.searchsorted(DELAY_EDGES, delays, side="right") - 1, 0, n_bins - 1
+    )
+    counts = np.bincount(codes * n_bins + bins, minlength=n_groups * n_bins)
+    on_time = np.bincount(codes[delays <= ON_TIME_MINUTES], minlength=n_groups)
+    nulls = np.bincount(group_codes[known & np.isnan(values)], minlength=n_groups)
+    maxima = np.full(n_groups, np.nan)
+    np.fmax.at(maxima, codes, delays)
+    return groups, counts.reshape(n_groups, n_bins), on_time, nulls, maxima
+
+
+def histogram_percentile(counts, q, maximum=np.nan):
+    """Percentile `q` of a DELAY_EDGES histogram, interpolated geometrically
+    within its bin and never past the exact maximum."""
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    cumulative = np.cumsum(counts)
+    target = q * total
+    j = min(np.searchsorted(cumulative, target, side="left"), len(counts) - 1)
+    if j == 0:
+        # Under a minute of delay
+        return 0.0
+    low, high = DELAY_EDGES[j], DELAY_EDGES[j + 1]
+    fraction = (target - (cumulative[j] - counts[j])) / counts[j]
+    return float(np.fmin(low * (high / low) ** fraction, maximum))
+
+
+def delay_summary(df, column, by):
+    """Passengers, nulls, percentiles, on-time rate and maximum of `column`
+    for every level of `by`, plus a "Total" row."""
+    groups, counts, on_time, nulls, maxima = delay_counts(df, column, by)
+    counts = np.vstack([counts, counts.sum(axis=0)])
+    on_time = np.append(on_time, on_time.sum())
+    nulls = np.append(nulls, nulls.sum())
+    maxima = np.append(maxima, np.fmax.reduce(maxima) if len(maxima) else np.nan)
+
+    rows = []
+    for label, hist, punctual, missing, maximum in zip(
+        [*groups, "Total"], counts, on_time, nulls, maxima
+    ):
+        total = hist.sum()
+        row = {by: label, "Pasajeros": total, "Nulos": missing}
+        for q in PERCENTILES:
+            row[f"p{q * 100:g}"] = histogram_percentile(hist, q, maximum)
+        row["A tiempo"] = punctual / total if total else np.nan
+        row["Máximo"] = maximum
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def delay_histogram(df, column, by, bins_per_octave=1):
+    """Share of each group's delayed passengers (1 minute or more) per log
+    bin, as a long table for a chart. Delays are whole minutes, so the
+    chart merges the fine bins into `bins_per_octave` per doubling."""
+    groups, counts, _, _, _ = delay_counts(df, column, by)
+    factor = BINS_PER_OCTAVE // bins_per_octave
+    delayed = counts[:, 1:].reshape(len(groups), -1, factor).sum(axis=2)
+    edges = DELAY_EDGES[1::factor]
+    totals = delayed.sum(axis=1, keepdims=True)
+    share = np.divide(delayed, totals, out=np.zeros(delayed.shape), where=totals > 0)
+    n_bins = delayed.shape[1]
+    return pd.DataFrame(
+        {
+            by: np.repeat(np.asarray(groups), n_bins),
+            "Start": np.tile(edges[:-1], len(groups)),
+            "End": np.tile(edges[1:], len(groups)),
+            "Count": delayed.ravel(),
+            "Share": share.ravel(),
+        }
+    )
@@ -1,50 +1,90 @@
 import numpy as np
 import pandas as pd
 
+from partial_stats import FramePartial, iter_chunks, parallel_partial, value_counts
 
-def summarize_dataframe(df):
-    summary_data = []
 
-    for col in df.columns:
-        data_type = df[col].dtype
-        # Simplify data type display
-        if data_type == "int64":
-            display_data_type = "int"
-        elif data_type == "float64":
-            display_data_type = "float"
-        elif data_type == "object":
-            display_data_type = "string"
-        else:
-            display_data_type = str(data_type)
+def _display_type(dtype):
+    # Simplify data type display; the typed loader stores narrower ints and
+    # categoricals, but the summary keeps reporting them as before
+    if pd.api.types.is_bool_dtype(dtype):
+        return str(dtype)
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if (
+        dtype == "object"
+        or isinstance(dtype, pd.CategoricalDtype)
+        or pd.api.types.is_string_dtype(dtype)
+    ):
+        return "string"
+    return str(dtype)
+
+
+def _summarize_column(name, dtype, rows, uniques, counts):
+    non_null_count = counts.sum()
+    null_count = rows - non_null_count
+    most_repeated_value = uniques[counts.argmax()] if len(counts) else None
+
+    # Initialize lowest and highest values as "-"
+    lowest_value = "-"
+    highest_value = "-"
+
+    # Min and max only depend on the distinct values, not on every row
+    if pd.api.types.is_numeric_dtype(dtype) and len(uniques):
+        lowest_value = uniques.min()
+        highest_value = uniques.max()
+
+    return {
+        "Columna": name,
+        "Tipo de dato": _display_type(dtype),
+        "Valores válidos": non_null_count,
+        "Valores nulos": null_count,
+        "Moda": most_repeated_value if pd.notnull(most_repeated_value) else "-",
+        "Valor mínimo": lowest_value,
+        "Valor máximo": highest_value,
+    }
+
 
-        non_null_count = df[col].notnull().sum()
-        null_count = df[col].isnull().sum()
-        most_repeated_value = (
-            df[col].value_counts().idxmax() if not df[col].isnull().all() else None
+def summarize_partial(partial):
+    # Same table as summarize_dataframe, from the value counts of a FramePartial
+    summary_data = []
+    for col, dtype in partial.dtypes.items():
+        counts = partial.counts[col]
+        summary_data.append(
+            _summarize_column(
+                col, dtype, partial.rows, counts.index.to_numpy(), counts.to_numpy()
+            )
         )
+    return pd.DataFrame(summary_data)
+
+
+def summarize_sketch(partial):
+    # Approximate summary of a SketchPartial, with the same type labels
+    summary = partial.summary()
+    summary["Tipo de dato"] = summary["Tipo de dato"].map(_display_type)
+    return summary
+
+
+def summarize_dataframe(df, n_jobs=None, approximate=False, **sketch_options):
+    summary_data = []
+
+    # Bounded-memory sketches instead of exact value counts
+    if approximate:
+        from sketches import SketchPartial, row_blocks
 
-        # Initialize lowest and highest values as "-"
-        lowest_value = "-"
-        highest_value = "-"
+        partial = SketchPartial.from_chunks(row_blocks(df), **sketch_options)
+        return summarize_sketch(partial)
 
-        # Check if the column data type is numeric to calculate min and max
-        if pd.api.types.is_numeric_dtype(data_type):
-            lowest_value = df[col].min()
-            highest_value = df[col].max()
-            # Adjust for non-numeric highest and lowest values
-            lowest_value = lowest_value if pd.notnull(lowest_value) else "-"
-            highest_value = highest_value if pd.notnull(highest_value) else "-"
+    # With n_jobs > 1 the counts come from per-slice partials merged together
+    if n_jobs and n_jobs > 1:
+        return summarize_partial(parallel_partial(df, n_jobs))
 
+    for col in df.columns:
+        uniques, counts = value_counts(df[col])
         summary_data.append(
-            {
-                "Columna": col,
-                "Tipo de dato": display_data_type,
-                "Valores válidos": non_null_count,
-                "Valores nulos": null_count,
-                "Moda": most_repeated_value if pd.notnull(most_repeated_value) else "-",
-                "Valor mínimo": lowest_value,
-                "Valor máximo": highest_value,
-            }
+            _summarize_column(col, df[col].dtype, len(df), uniques, counts)
         )
 
     summary_df = pd.DataFrame(summary_data)
@@ -60,7 +100,19 @@ def format_numbers(x):
     return x
 
 
-def extended_describe(df):
+def extended_describe(df, n_jobs=None, approximate=False, **sketch_options):
+    if approximate:
+        # Sketched quartiles, with their rank error as an extra row
+        from sketches import SketchPartial, row_blocks
+
+        desc = SketchPartial.from_chunks(row_blocks(df), **sketch_options).describe()
+        return desc.map(format_numbers)
+
+    if n_jobs and n_jobs > 1:
+        # Moments and quantiles merged from per-slice partials
+        desc = parallel_partial(df, n_jobs).describe()
+        return desc.map(format_numbers)
+
     desc = df.describe()
     desc = desc.rename(
         index={
@@ -83,3 +135,35 @@ def extended_describe(df):
     desc = desc.map(format_numbers)
 
     return desc
+
+
+def extended_describe_chunked(
+    source, chunksize=100_000, normalize=True, approximate=False, **sketch_options
+):
+    # Same table as extended_describe, accumulated chunk by chunk so the full
+    # file never has to be in memory. `source` is a CSV/Parquet path or an
+    # iterable of DataFrames
+    chunks = iter_chunks(source, chunksize, normalize)
+    if approximate:
+        # Exact quantiles keep every distinct value; sketches stay bounded
+        from sketches import SketchPartial
+
+        partial = SketchPartial.from_chunks(chunks, **sketch_options)
+    else:
+        partial = FramePartial.from_chunks(chunks)
+    desc = partial.describe()
+
+    # Apply the format_numbers function
+    desc = desc.map(format_numbers)
+
+    return desc
+
+
+def summarize_chunked(source, chunksize=100_000, normalize=True, **sketch_options):
+    # Approximate summarize_dataframe in bounded memory, chunk by chunk
+    from sketches import SketchPartial
+
+    partial = SketchPartial.from_chunks(
+        iter_chunks(source, chunksize, normalize), **sketch_options
+    )
+    return summarize_sketch(partial)
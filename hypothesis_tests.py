@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from aggregates import RATINGS, rating_matrix
+
+
+def rating_columns(df, target):
+    # Survey questions: integer columns whose answers stay within 0-5
+    return [
+        col
+        for col in df.columns
+        if col != target
+        and pd.api.types.is_integer_dtype(df[col].dtype)
+        and df[col].between(RATINGS[0], RATINGS[-1]).all()
+    ]
+
+
+def contingency_tables(df, target, columns):
+    """Question x rating x target-level counts from a single rating_matrix pass."""
+    matrix = rating_matrix(df, columns, by=target)
+    levels = matrix.index.levels[0]
+    tables = matrix.to_numpy().reshape(len(levels), len(columns), len(RATINGS))
+    return tables.transpose(1, 2, 0), levels
+
+
+def chi_square(table):
+    """Chi-square test of independence, as scipy.stats.chi2_contingency."""
+    # pd.crosstab only has rows/columns for levels that occur
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0].astype(np.float64)
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
+    dof = (table.shape[0] - 1) * (table.shape[1] - 1)
+    difference = table - expected
+    if dof == 1:
+        # Yates' correction, applied by scipy for 2x2 tables
+        difference = np.sign(difference) * np.maximum(np.abs(difference) - 0.5, 0)
+    statistic = (difference**2 / expected).sum()
+    return statistic, stats.chi2.sf(statistic, dof)
+
+
+def mann_whitney(counts_1, counts_2):
+    """Two-sided Mann-Whitney U of group 1 vs group 2 from counts per rating.
+
+    Average ranks only depend on how many answers fall on each level, so
+    this matches scipy.stats.mannwhitneyu (asymptotic, with continuity and
+    tie correction) without sorting any rows."""
+    counts_1 = counts_1.astype(np.float64)
+    counts_2 = counts_2.astype(np.float64)
+    ties = counts_1 + counts_2
+    n1, n2 = counts_1.sum(), counts_2.sum()
+    n = n1 + n2
+
+    ranks = np.cumsum(ties) - ties + (ties + 1) / 2
+    u1 = (counts_1 * ranks).sum() - n1 * (n1 + 1) / 2
+    u = max(u1, n1 * n2 - u1)
+
+    tie_term = (ties**3 - ties).sum()
+    s = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    z = (u - n1 * n2 / 2 - 0.5) / s
+    return u1, min(2 * stats.norm.sf(z), 1.0)
+
+
+def _central_moments(values, counts):
+    n = counts.sum()
+    mean = (values * counts).sum() / n
+    d = values - mean
+    return n, mean, *((counts * d**k).sum() / n for k in (2, 3, 4))
+
+
+def normal_test(values, counts):
+    """D'Agostino-Pearson K^2 normality test (scipy.stats.normaltest) from counts."""
+    n, _, m2, m3, m4 = _central_moments(values, counts)
+
+    # Skewness test
+    b2 = m3 / m2**1.5
+    y = b2 * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (
+        3.0
+        * (n**2 + 27 * n - 70)
+        * (n + 1)
+        * (n + 3)
+        / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    )
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = y if y != 0 else 1
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    # Kurtosis test
+    b2 = m4 / m2**2
+    expected = 3.0 * (n - 1) / (n + 1)
+    variance = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    x = (b2 - expected) / np.sqrt(variance)
+    sqrt_beta1 = (
+        6.0
+        * (n * n - 5 * n + 2)
+        / ((n + 7) * (n + 9))
+        * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3)))
+    )
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1**2))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    term2 = np.sign(denom) * np.power((1 - 2.0 / a) / np.abs(denom), 1 / 3.0)
+    z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+    statistic = z_skew**2 + z_kurt**2
+    return statistic, stats.chi2.sf(statistic, 2)
+
+
+def ks_normal(values, counts):
+    """Kolmogorov-Smirnov distance to a normal with the sample mean and std."""
+    n, mean, m2, _, _ = _central_moments(values, counts)
+    std = np.sqrt(m2 * n / (n - 1))
+    cdf = stats.norm.cdf(values, mean, std)
+    ecdf = np.cumsum(counts) / n
+    ecdf_before = ecdf - counts / n
+    statistic = max(np.abs(ecdf - cdf).max(), np.abs(ecdf_before - cdf).max())
+    return statistic, stats.kstwo.sf(statistic, int(n))
+
+
+def run_tests(df, target="Satisfaction", columns=None, positive=None):
+    """Chi-square, Mann-Whitney U and normality tests for every question,
+    as one tidy table (question, test, statistic, p_value)."""
+    if columns is None:
+        columns = rating_columns(df, target)
+    tables, levels = contingency_tables(df, target, columns)
+    if positive is None:
+        positive = 1 if pd.api.types.is_numeric_dtype(df[target].dtype) else "Satisfied"
+    group_1 = levels.get_loc(positive)
+    group_2 = [i for i in range(len(levels)) if i != group_1]
+
+    values = RATINGS.astype(np.float64)
+    rows = []
+    for question, table in zip(columns, tables):
+        totals = table.sum(axis=1)
+        present = totals > 0
+        results = {
+            "chi2": chi_square(table),
+            "mann_whitney_u": mann_whitney(
+                table[:, group_1], table[:, group_2].sum(axis=1)
+            ),
+            "normaltest": normal_test(values[present], totals[present]),
+            "kstest_normal": ks_normal(values[present], totals[present]),
+        }
+        for test, (statistic, p_value) in results.items():
+            rows.append(
+                {
+                    "question": question,
+                    "test": test,
+                    "statistic": statistic,
+                    "p_value": p_value,
+                }
+            )
+    return pd.DataFrame(rows)
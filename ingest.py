@@ -0,0 +1,237 @@
+import argparse
+import logging
+import os
+import pickle
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from aggregates import build_cube, cube_directory, merge_cubes, save_cube
+from dataset import (
+    CACHE_DIR,
+    MANIFEST,
+    PARTITIONS_DIR,
+    _write_atomic,
+    _write_meta,
+    file_hash,
+    manifest_fingerprint,
+    read_manifest,
+)
+from helper_functions import format_numbers, summarize_partial
+from model import SatisfactionModel
+from partial_stats import FramePartial, iter_chunks
+from schema import validate
+
+EDA_DIR = os.path.join("data", "eda")
+STATE_DIR = "_state"
+REJECTED_DIR = "_rejected"
+
+logger = logging.getLogger("ingest")
+
+
+def _write_pickle(path, value):
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    _write_atomic(path, write)
+
+
+def _read_pickle(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _state_path(directory, name):
+    return os.path.join(directory, STATE_DIR, f"{name}.pkl")
+
+
+def _state_name(partition):
+    return os.path.splitext(partition["file"])[0]
+
+
+def _partition_state(chunk):
+    return {"partial": FramePartial.from_frame(chunk), "cube": build_cube(chunk)}
+
+
+def _load_state(directory, partition):
+    # A missing or unreadable state is rebuilt from the partition itself
+    path = _state_path(directory, _state_name(partition))
+    state = _read_pickle(path)
+    if state is None:
+        chunk = pd.read_parquet(os.path.join(directory, partition["file"]))
+        state = _partition_state(chunk)
+        _write_pickle(path, state)
+    return state
+
+
+def write_partitions(path, directory, sha256, chunksize, model=None):
+    """Normalize `path` chunk by chunk into Parquet partitions, keeping the
+    partial statistics and cube of every partition next to it. With a
+    `model`, each partition is also scored. Returns the partitions and the
+    merged state of the whole file. Rows that break the schema are left out
+    and written to _rejected/<partition>.csv."""
+    partitions = []
+    states = []
+    for i, raw in enumerate(iter_chunks(path, chunksize, normalize=False)):
+        name = f"part-{sha256[:16]}-{i:05d}"
+        chunk, rejected = validate(raw)
+        if len(rejected):
+            os.makedirs(os.path.join(directory, REJECTED_DIR), exist_ok=True)
+            _write_atomic(
+                os.path.join(directory, REJECTED_DIR, f"{name}.csv"),
+                lambda tmp_path: rejected.to_csv(tmp_path),
+            )
+        _write_atomic(
+            os.path.join(directory, f"{name}.parquet"),
+            lambda tmp_path: chunk.to_parquet(tmp_path, index=False),
+        )
+        state = _partition_state(chunk)
+        _write_pickle(_state_path(directory, name), state)
+        partition = {
+            "file": f"{name}.parquet",
+            "rows": len(chunk),
+            "rejected": len(rejected),
+        }
+        if model is not None:
+            scores = pd.DataFrame({"probability": model.predict_proba(chunk)})
+            partition["scores"] = f"{name}.scores.parquet"
+            _write_atomic(
+                os.path.join(directory, partition["scores"]),
+                lambda tmp_path: scores.to_parquet(tmp_path, index=False),
+            )
+        partitions.append(partition)
+        states.append(state)
+    return partitions, merge_states(states)
+
+
+def merge_states(states):
+    total = None
+    for state in states:
+        if total is None:
+            total = dict(state)
+        else:
+            total = {
+                "partial": total["partial"].merge(state["partial"]),
+                "cube": merge_cubes(total["cube"], state["cube"]),
+            }
+    return total
+
+
+def load_totals(directory, manifest):
+    """Merged state of every ingested partition.
+
+    The running total is kept on disk; if it is missing or out of date it is
+    rebuilt from the per-partition states. Only a partition whose own state
+    is missing is read again.
+    """
+    fingerprint = manifest_fingerprint(manifest)
+    total = _read_pickle(_state_path(directory, "total"))
+    if total is not None and total["fingerprint"] == fingerprint:
+        return total
+
+    total = merge_states(
+        _load_state(directory, partition)
+        for batch in manifest["batches"]
+        for partition in batch["partitions"]
+    )
+    if total is not None:
+        total["fingerprint"] = fingerprint
+        _write_pickle(_state_path(directory, "total"), total)
+    return total
+
+
+def write_artifacts(total, eda_dir=EDA_DIR, cache_dir=CACHE_DIR):
+    # Same files analysis.ipynb writes, plus the dashboard cube for this
+    # version of the partitions, so the app never has to rebuild it
+    os.makedirs(eda_dir, exist_ok=True)
+    total["partial"].describe().map(format_numbers).to_csv(
+        os.path.join(eda_dir, "extended_describe.csv")
+    )
+    summarize_partial(total["partial"]).to_csv(
+        os.path.join(eda_dir, "summary.csv"), index=False
+    )
+    save_cube(total["cube"], cube_directory(total["fingerprint"], cache_dir))
+
+
+def ingest(
+    paths,
+    directory=PARTITIONS_DIR,
+    eda_dir=EDA_DIR,
+    cache_dir=CACHE_DIR,
+    chunksize=100_000,
+    model=None,
+):
+    """Append new survey files to the partitioned dataset and update the
+    derived artifacts from partial statistics. Files that were already
+    ingested (same content) are skipped. Returns the updated manifest."""
+    os.makedirs(os.path.join(directory, STATE_DIR), exist_ok=True)
+    manifest = read_manifest(directory)
+    total = load_totals(directory, manifest)
+    seen = {batch["sha256"] for batch in manifest["batches"]}
+
+    for path in paths:
+        sha256 = file_hash(path)
+        if sha256 in seen:
+            logger.info("%s: ya ingresado, se omite", path)
+            continue
+
+        partitions, batch_total = write_partitions(
+            path, directory, sha256, chunksize, model
+        )
+        manifest["batches"].append(
+            {
+                "source": os.path.abspath(path),
+                "sha256": sha256,
+                "ingested_at": datetime.now(timezone.utc).isoformat(),
+                "partitions": partitions,
+            }
+        )
+        seen.add(sha256)
+        if batch_total is not None:
+            total = merge_states([s for s in (total, batch_total) if s is not None])
+        logger.info(
+            "%s: %s filas, %s rechazadas",
+            path,
+            f"{sum(p['rows'] for p in partitions):,}",
+            f"{sum(p['rejected'] for p in partitions):,}",
+        )
+
+    # The manifest is the commit point: partitions it does not list are ignored
+    _write_meta(os.path.join(directory, MANIFEST), manifest)
+    if total is not None:
+        total["fingerprint"] = manifest_fingerprint(manifest)
+        _write_pickle(_state_path(directory, "total"), total)
+        write_artifacts(total, eda_dir, cache_dir)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Agrega nuevos lotes de encuestas al dataset particionado"
+    )
+    parser.add_argument("paths", nargs="+", help="Archivos CSV o Parquet")
+    parser.add_argument("--partitions", default=PARTITIONS_DIR)
+    parser.add_argument("--eda", default=EDA_DIR)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--model", help="Modelo para puntuar cada lote (model.py)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    model = SatisfactionModel.load(args.model) if args.model else None
+    manifest = ingest(
+        args.paths, args.partitions, args.eda, chunksize=args.chunksize, model=model
+    )
+    rows = sum(
+        partition["rows"]
+        for batch in manifest["batches"]
+        for partition in batch["partitions"]
+    )
+    print(f"{len(manifest['batches'])} lotes, {rows:,} filas en {args.partitions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# Spearman and point-biserial correlations for the KNIME workflow's
+# "Python Script (#9)" and "(#10)" nodes, read batch by batch through the
+# Arrow interface instead of converting the whole input table to pandas.
+# The node scripts become:
+#
+#     import knime.scripting.io as knio
+#     from knime_batches import spearman_node
+#
+#     spearman_node(knio)
+#
+# (biserial_node for #10). Locally, the same code runs against a file:
+#
+#     python knime_batches.py spearman data/airline_correlation2.csv
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy import stats
+
+TARGET = "satisfaction"
+
+# First column of every KNIME Arrow batch: the row keys, as strings
+ROW_ID = "<RowID>"
+
+
+class ContingencyTable:
+    """Counts of every (question value, target value) pair of one column.
+
+    The table adds up across batches, and both coefficients follow from it
+    exactly: the point-biserial is Pearson's r on the values weighted by
+    the counts, Spearman's is the same on the tie-averaged ranks, which the
+    cumulative counts give without sorting any rows.
+    """
+
+    def __init__(self, counts=None):
+        self.counts = counts if counts is not None else pd.DataFrame(dtype=np.int64)
+
+    def update(self, x, y):
+        # Rows with a null in either column are left out
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x_values, x_codes = np.unique(x[valid], return_inverse=True)
+        y_values, y_codes = np.unique(y[valid], return_inverse=True)
+        counts = np.bincount(
+            x_codes * len(y_values) + y_codes,
+            minlength=len(x_values) * len(y_values),
+        ).reshape(len(x_values), len(y_values))
+        return self.merge(
+            ContingencyTable(pd.DataFrame(counts, index=x_values, columns=y_values))
+        )
+
+    def merge(self, other):
+        counts = self.counts.add(other.counts, fill_value=0).fillna(0)
+        return ContingencyTable(counts.astype(np.int64).sort_index().sort_index(axis=1))
+
+    def _pearson(self, x, y):
+        """Pearson r and two-sided p-value of per-level scores x (rows) and
+        y (columns), weighted by the counts."""
+        counts = self.counts.to_numpy(dtype=np.float64)
+        n = counts.sum()
+        if n < 3:
+            return np.nan, np.nan
+        xc = x - (counts.sum(axis=1) @ x) / n
+        yc = y - (counts.sum(axis=0) @ y) / n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = (xc @ counts @ yc) / np.sqrt(
+                (counts.sum(axis=1) @ xc**2) * (counts.sum(axis=0) @ yc**2)
+            )
+            r = np.clip(r, -1.0, 1.0)
+            t = r * np.sqrt((n - 2) / ((1.0 - r) * (1.0 + r)))
+        return r, 2 * stats.t.sf(np.abs(t), n - 2)
+
+    def pointbiserial(self):
+        return self._pearson(
+            self.counts.index.to_numpy(dtype=np.float64),
+            self.counts.columns.to_numpy(dtype=np.float64),
+        )
+
+    def spearman(self):
+        return self._pearson(
+            _midranks(self.counts.sum(axis=1).to_numpy()),
+            _midranks(self.counts.sum(axis=0).to_numpy()),
+        )
+
+
+def _midranks(totals):
+    # Average rank of the rows sharing each (sorted) value
+    ends = np.cumsum(totals).astype(np.float64)
+    return ends - (totals - 1) / 2
+
+
+def _column(batch, name):
+    return pc.cast(batch.column(name), pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def accumulate(batches, target=TARGET, columns=None):
+    """One ContingencyTable per question, from an iterable of Arrow record
+    batches (or KNIME batches, which convert with to_pyarrow)."""
+    tables = None
+    for batch in batches:
+        if hasattr(batch, "to_pyarrow"):
+            batch = batch.to_pyarrow()
+        if tables is None:
+            # As in the original nodes: every data column but the target
+            names = [
+                name for name in batch.schema.names if name not in (ROW_ID, target)
+            ]
+            tables = {name: ContingencyTable() for name in columns or names}
+        y = _column(batch, target)
+        for name, table in tables.items():
+            tables[name] = table.update(_column(batch, name), y)
+    return tables or {}
+
+
+def correlation_table(tables, method):
+    """`question, <method>_correlation, <method>_p_value` rows, the output
+    of the KNIME nodes; `method` is "spearman" or "biserial"."""
+    rows = []
+    for question, table in tables.items():
+        if method == "spearman":
+            corr, p_value = table.spearman()
+        else:
+            corr, p_value = table.pointbiserial()
+        rows.append(
+            {
+                "question": question,
+                f"{method}_correlation": corr,
+                f"{method}_p_value": p_value,
+            }
+        )
+    return pd.DataFrame(
+        rows, columns=["question", f"{method}_correlation", f"{method}_p_value"]
+    )
+
+
+def run_node(knio, method, target=TARGET):
+    tables = accumulate(knio.input_tables[0].batches(), target)
+    knio.output_tables[0] = knio.Table.from_pandas(correlation_table(tables, method))
+
+
+def spearman_node(knio, target=TARGET):
+    """Body of "Python Script (#9)"."""
+    run_node(knio, "spearman", target)
+
+
+def biserial_node(knio, target=TARGET):
+    """Body of "Python Script (#10)"."""
+    run_node(knio, "biserial", target)
+
+
+class LocalBatch:
+    def __init__(self, batch):
+        self._batch = batch
+
+    def to_pyarrow(self):
+        return self._batch
+
+    def to_pandas(self):
+        return self._batch.to_pandas()
+
+
+class LocalTable:
+    """Stand-in for a knime.scripting.io table: a CSV or Parquet file read
+    in record batches, or a DataFrame (as produced by from_pandas)."""
+
+    def __init__(self, source, batch_size=65_536):
+        self.source = source
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_pandas(cls, df):
+        return cls(df)
+
+    def batches(self):
+        # Rows are keyed Row0, Row1, ... as KNIME does for a new table
+        offset = 0
+        for batch in self._batches():
+            keys = pa.array([f"Row{i}" for i in range(offset, offset + len(batch))])
+            offset += len(batch)
+            yield LocalBatch(
+                pa.RecordBatch.from_arrays(
+                    [keys, *batch.columns], names=[ROW_ID, *batch.schema.names]
+                )
+            )
+
+    def _batches(self):
+        if isinstance(self.source, pd.DataFrame):
+            table = pa.Table.from_pandas(self.source, preserve_index=False)
+            batches = table.to_batches(max_chunksize=self.batch_size)
+        elif str(self.source).endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(self.source)
+            batches = parquet.iter_batches(batch_size=self.batch_size)
+        else:
+            from pyarrow import csv
+
+            # block_size is in bytes; a few dozen bytes per survey row
+            batches = csv.open_csv(
+                self.source,
+                read_options=csv.ReadOptions(block_size=self.batch_size * 64),
+            )
+        return batches
+
+    def to_pandas(self):
+        if isinstance(self.source, pd.DataFrame):
+            return self.source
+        frames = (batch.to_pandas().set_index(ROW_ID) for batch in self.batches())
+        return pd.concat(frames).rename_axis(None)
+
+
+class LocalIO:
+    """Stand-in for the knime.scripting.io module, with one input table."""
+
+    Table = LocalTable
+
+    def __init__(self, source, batch_size=65_536):
+        self.input_tables = [LocalTable(source, batch_size)]
+        self.output_tables = [None]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Nodos Python de KNIME (#9 y #10) sobre un archivo local"
+    )
+    parser.add_argument("method", choices=["spearman", "biserial"])
+    parser.add_argument("path", nargs="?", default="data/airline_correlation2.csv")
+    parser.add_argument("--target", default=TARGET)
+    parser.add_argument("--batch-size", type=int, default=65_536)
+    args = parser.parse_args()
+
+    knio = LocalIO(args.path, args.batch_size)
+    run_node(knio, args.method, args.target)
+    print(knio.output_tables[0].to_pandas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from aggregates import AGE_BINS, RATINGS
+from dataset import DATA_PATH, _write_atomic, load_dataset
+from partial_stats import iter_chunks
+from schema import RATING_COLUMNS
+
+MODEL_PATH = os.path.join("data", "model.npz")
+
+# Rows of the one-hot design matrix held at a time while fitting
+FIT_CHUNK = 32_768
+
+DEMOGRAPHIC_COLUMNS = ["Gender", "Customer Type", "Type Of Travel", "Class"]
+
+# Numeric columns enter the model binned, so every feature is a small code
+BINNED_COLUMNS = {
+    "Age": AGE_BINS,
+    "Flight Distance": np.arange(0, 5500, 500),
+}
+
+
+def _feature_codes(series, kind, levels):
+    """Codes 0..len(levels)-1 of one feature; nulls and unknown values get
+    the extra code len(levels), whose weight is always 0."""
+    n_levels = len(levels)
+    if kind == "rating":
+        values = series.to_numpy()
+        valid = (values >= 0) & (values < n_levels)
+        return np.where(valid, values, n_levels).astype(np.int16)
+
+    if kind == "binned":
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.clip(
+            np.searchsorted(levels, values, side="right") - 1, 0, n_levels - 1
+        )
+        return np.where(np.isnan(values), n_levels, codes).astype(np.int16)
+
+    # Categorical: recode through the (few) categories, not row by row
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    lookup = pd.Index(levels).get_indexer(series.cat.categories)
+    lookup = np.append(np.where(lookup >= 0, lookup, n_levels), n_levels)
+    return lookup[series.cat.codes.to_numpy()].astype(np.int16)
+
+
+def _one_hot(codes, offsets, start, stop):
+    """Rows start:stop of the one-hot encoding of `codes`, with a trailing
+    intercept column; null and unknown codes are all zeros."""
+    X = np.zeros((stop - start, offsets[-1] + 1))
+    X[:, -1] = 1.0
+    rows = np.arange(stop - start)
+    for j, col_codes in enumerate(codes):
+        chunk = col_codes[start:stop]
+        known = chunk < offsets[j + 1] - offsets[j]
+        X[rows[known], offsets[j] + chunk[known]] = 1.0
+    return X
+
+
+class SatisfactionModel:
+    """Logistic regression of Satisfaction on the ratings and demographics.
+
+    Every feature is a small code (a rating, a category or a bin), so the
+    model is one table of weights per feature and scoring a row is a lookup
+    and a sum per feature, with no design matrix.
+    """
+
+    def __init__(self, features, tables, bias, positive, frequencies, evaluation=None):
+        # features: [(column, kind, levels)], one weight table per feature
+        self.features = features
+        self.tables = tables
+        self.bias = bias
+        self.positive = positive
+        self.frequencies = frequencies
+        # Metrics on the rows held out from training (see main), if any
+        self.evaluation = evaluation
+
+    @staticmethod
+    def default_features(df):
+        features = [(col, "rating", RATINGS) for col in RATING_COLUMNS]
+        for col in DEMOGRAPHIC_COLUMNS:
+            levels = df[col].astype("category").cat.categories.to_numpy()
+            features.append((col, "categorical", levels))
+        for col, edges in BINNED_COLUMNS.items():
+            features.append((col, "binned", edges[:-1]))
+        return features
+
+    def encode(self, df):
+        return [
+            _feature_codes(df[col], kind, levels) for col, kind, levels in self.features
+        ]
+
+    @classmethod
+    def fit(
+        cls,
+        df,
+        target="Satisfaction",
+        positive="Satisfied",
+        l2=1.0,
+        max_iter=50,
+        tol=1e-8,
+    ):
+        """Ridge-penalized IRLS (Newton) on the one-hot encoding of the codes.
+
+        The encoding is only ever built FIT_CHUNK rows at a time: X'WX and
+        the gradient add up over the chunks, so memory does not grow with
+        the number of rows.
+        """
+        features = cls.default_features(df)
+        model = cls(features, [], 0.0, positive, [])
+        codes = model.encode(df)
+        y = (df[target] == positive).to_numpy(dtype=np.float64)
+
+        sizes = [len(levels) for _, _, levels in features]
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        chunks = [
+            (start, min(start + FIT_CHUNK, len(df)))
+            for start in range(0, len(df), FIT_CHUNK)
+        ]
+
+        # The intercept is not penalized
+        penalty = np.full(offsets[-1] + 1, l2)
+        penalty[-1] = 0.0
+        beta = np.zeros(offsets[-1] + 1)
+        for _ in range(max_iter):
+            gradient = -penalty * beta
+            hessian = np.diag(penalty)
+            for start, stop in chunks:
+                X = _one_hot(codes, offsets, start, stop)
+                p = 1.0 / (1.0 + np.exp(-(X @ beta)))
+                gradient += X.T @ (y[start:stop] - p)
+                hessian += (X.T * (p * (1 - p))) @ X
+            step = np.linalg.solve(hessian, gradient)
+            beta += step
+            if np.abs(step).max() < tol:
+                break
+
+        counts = np.concatenate(
+            [
+                np.bincount(col_codes, minlength=size + 1)[:size]
+                for col_codes, size in zip(codes, sizes)
+            ]
+        )
+        model.tables = [beta[offsets[j] : offsets[j + 1]] for j in range(len(sizes))]
+        model.frequencies = [
+            counts[offsets[j] : offsets[j + 1]] / len(df) for j in range(len(sizes))
+        ]
+        model.bias = float(beta[-1])
+        return model
+
+    def decision_function(self, df):
+        logit = np.full(len(df), self.bias, dtype=np.float32)
+        for (col, kind, levels), table in zip(self.features, self.tables):
+            # Trailing 0 is the weight of nulls and unknown values
+            weights = np.append(table, 0.0).astype(np.float32)
+            logit += weights[_feature_codes(df[col], kind, levels)]
+        return logit
+
+    def predict_proba(self, df):
+        """Probability of the positive class for every row."""
+        logit = self.decision_function(df)
+        return 1.0 / (1.0 + np.exp(-logit))
+
+    def predict(self, df, threshold=0.5):
+        return self.predict_proba(df) >= threshold
+
+    def score_batches(self, chunks):
+        """Yield (chunk, probability) for an iterable of frames, e.g. iter_chunks."""
+        for chunk in chunks:
+            yield chunk, self.predict_proba(chunk)
+
+    def coefficients(self):
+        """Weight of every level of every feature, relative to a null answer."""
+        return pd.DataFrame(
+            [
+                {"feature": col, "level": level, "weight": weight}
+                for (col, _, levels), table in zip(self.features, self.tables)
+                for level, weight in zip(levels, table)
+            ]
+        )
+
+    def feature_importance(self):
+        """Spread of each feature's contribution to the log-odds over the
+        training rows (frequency weighted standard deviation)."""
+        importance = {}
+        for (col, _, _), table, freq in zip(
+            self.features, self.tables, self.frequencies
+        ):
+            mean = (table * freq).sum() / freq.sum()
+            importance[col] = np.sqrt((freq * (table - mean) ** 2).sum() / freq.sum())
+        return (
+            pd.Series(importance, name="importance")
+            .rename_axis("feature")
+            .sort_values(ascending=False)
+            .reset_index()
+        )
+
+    def save(self, path=MODEL_PATH):
+        meta = {
+            "positive": self.positive,
+            "bias": self.bias,
+            "evaluation": self.evaluation,
+            "features": [
+                {"column": col, "kind": kind, "levels": np.asarray(levels).tolist()}
+                for col, kind, levels in self.features
+            ],
+        }
+        arrays = {}
+        for j, (table, freq) in enumerate(zip(self.tables, self.frequencies)):
+            arrays[f"table_{j}"] = table
+            arrays[f"frequency_{j}"] = freq
+
+        def write(tmp_path):
+            # A file object, so savez does not append ".npz" to the name
+            with open(tmp_path, "wb") as f:
+                np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+
+        _write_atomic(path, write)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].item())
+            n = len(meta["features"])
+            tables = [data[f"table_{j}"] for j in range(n)]
+            frequencies = [data[f"frequency_{j}"] for j in range(n)]
+        features = [
+            (f["column"], f["kind"], np.asarray(f["levels"])) for f in meta["features"]
+        ]
+        return cls(
+            features,
+            tables,
+            meta["bias"],
+            meta["positive"],
+            frequencies,
+            meta.get("evaluation"),
+        )
+
+
+def evaluate(y, probability):
+    """Accuracy, log loss and ROC AUC (from ranks, with ties averaged)."""
+    # scipy is slow to import and only needed here, not by the dashboard
+    from scipy import stats
+
+    y = np.asarray(y, dtype=bool)
+    p = np.clip(probability.astype(np.float64), 1e-12, 1 - 1e-12)
+    ranks = stats.rankdata(p)
+    n_pos, n_neg = y.sum(), (~y).sum()
+    return {
+        "accuracy": float(((p >= 0.5) == y).mean()),
+        "log_loss": float(-np.mean(np.where(y, np.log(p), np.log(1 - p)))),
+        "auc": float((ranks[y].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelo de satisfacción")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Entrena y guarda el modelo")
+    train.add_argument("path", nargs="?", default=DATA_PATH)
+    train.add_argument("--model", default=MODEL_PATH)
+    train.add_argument("--l2", type=float, default=1.0)
+    train.add_argument("--holdout", type=float, default=0.2)
+    train.add_argument("--seed", type=int, default=0)
+
+    score = commands.add_parser("score", help="Puntúa un archivo por lotes")
+    score.add_argument("path")
+    score.add_argument("--model", default=MODEL_PATH)
+    score.add_argument("--output", required=True, help="Parquet con las probabilidades")
+    score.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        df = load_dataset(args.path)
+        test = np.random.default_rng(args.seed).random(len(df)) < args.holdout
+        model = SatisfactionModel.fit(df[~test], l2=args.l2)
+        if test.any():
+            y = df.loc[test, "Satisfaction"] == model.positive
+            model.evaluation = evaluate(y, model.predict_proba(df[test]))
+            print(model.evaluation)
+        model.save(args.model)
+        print(model.feature_importance().to_string(index=False))
+    else:
+        model = SatisfactionModel.load(args.model)
+        scores = [
+            probability
+            for _, probability in model.score_batches(
+                iter_chunks(args.path, args.chunksize)
+            )
+        ]
+        pd.DataFrame({"probability": np.concatenate(scores)}).to_parquet(args.output)
+        print(f"{sum(len(s) for s in scores):,} filas puntuadas en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
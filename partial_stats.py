@@ -0,0 +1,316 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+DESCRIBE_INDEX = [
+    "Total de valores",
+    "Media",
+    "Desviación estándar",
+    "Mínimo",
+    "Q1",
+    "Q2",
+    "Q3",
+    "Máximo",
+    "RIC",
+    "Asimetría",
+    "Curtosis",
+]
+
+
+def value_counts(series):
+    # Distinct non-null values and their counts in a single pass over the column
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        present = counts > 0
+        return series.cat.categories.to_numpy()[present], counts[present]
+
+    values = series.to_numpy()
+    if values.dtype.kind in "iu":
+        if len(values) == 0:
+            return values, np.zeros(0, dtype=np.int64)
+        low, high = int(values.min()), int(values.max())
+        # Dense bincount over the value range when it is not much larger than the data
+        if high - low <= max(len(values), 1 << 16):
+            counts = np.bincount(values.astype(np.int64) - low)
+            present = np.flatnonzero(counts)
+            return (present + low).astype(values.dtype), counts[present]
+        return np.unique(values, return_counts=True)
+
+    if values.dtype.kind == "f":
+        return np.unique(values[~np.isnan(values)], return_counts=True)
+
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return np.asarray(uniques), counts
+
+
+def central_moments(values):
+    """Return count, mean and the 2nd-4th central moment sums of `values`."""
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return np.zeros(5)
+    mean = values.mean()
+    d = values - mean
+    d2 = d * d
+    return np.array([n, mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum()])
+
+
+def merge_moments(a, b):
+    # Pairwise update from Pébay (2008), exact for any split of the rows
+    n_a, mean_a, m2_a, m3_a, m4_a = a
+    n_b, mean_b, m2_b, m3_b, m4_b = b
+    if n_a == 0:
+        return b.copy()
+    if n_b == 0:
+        return a.copy()
+
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    delta_n = delta / n
+    mean = mean_a + n_b * delta_n
+    m2 = m2_a + m2_b + delta * delta_n * n_a * n_b
+    m3 = (
+        m3_a
+        + m3_b
+        + delta * delta_n**2 * n_a * n_b * (n_a - n_b)
+        + 3 * delta_n * (n_a * m2_b - n_b * m2_a)
+    )
+    m4 = (
+        m4_a
+        + m4_b
+        + delta * delta_n**3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+        + 6 * delta_n**2 * (n_a * n_a * m2_b + n_b * n_b * m2_a)
+        + 4 * delta_n * (n_a * m3_b - n_b * m3_a)
+    )
+    return np.array([n, mean, m2, m3, m4])
+
+
+def counts_quantile(values, counts, q):
+    # Linear interpolation between order statistics, like Series.quantile
+    n = counts.sum()
+    if n == 0:
+        return np.nan
+    cumulative = np.cumsum(counts)
+    position = (n - 1) * q
+    lower = values[np.searchsorted(cumulative, np.floor(position), side="right")]
+    upper = values[np.searchsorted(cumulative, np.ceil(position), side="right")]
+    return lower + (upper - lower) * (position - np.floor(position))
+
+
+def _skew(n, m2, m3):
+    # Same bias-corrected estimator as Series.skew
+    if n < 3:
+        return np.nan
+    if m2 == 0:
+        return 0.0
+    return (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2**1.5)
+
+
+def _kurtosis(n, m2, m4):
+    # Same bias-corrected excess kurtosis as Series.kurtosis
+    if n < 4:
+        return np.nan
+    if m2 == 0:
+        return 0.0
+    adj = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+    return n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2**2) - adj
+
+
+class FramePartial:
+    """Mergeable statistics for a slice of rows of a survey frame."""
+
+    def __init__(self, dtypes, rows, counts, moments):
+        self.dtypes = dtypes
+        self.rows = rows
+        self.counts = counts
+        self.moments = moments
+
+    @classmethod
+    def from_frame(cls, df):
+        dtypes = {}
+        counts = {}
+        moments = {}
+        for col in df.columns:
+            series = df[col]
+            dtypes[col] = series.dtype
+            uniques, col_counts = value_counts(series)
+            counts[col] = pd.Series(col_counts, index=uniques, dtype=np.int64)
+            if pd.api.types.is_numeric_dtype(series.dtype) and not (
+                pd.api.types.is_bool_dtype(series.dtype)
+            ):
+                moments[col] = central_moments(
+                    series.to_numpy(dtype=np.float64, na_value=np.nan)
+                )
+        return cls(dtypes, len(df), counts, moments)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        partial = None
+        for chunk in chunks:
+            chunk_partial = cls.from_frame(chunk)
+            partial = chunk_partial if partial is None else partial.merge(chunk_partial)
+        return partial
+
+    def merge(self, other):
+        dtypes = dict(self.dtypes)
+        for col, dtype in other.dtypes.items():
+            dtypes.setdefault(col, dtype)
+
+        counts = {}
+        for col in dtypes:
+            a = self.counts.get(col)
+            b = other.counts.get(col)
+            if a is None or b is None:
+                counts[col] = a if b is None else b
+            else:
+                counts[col] = a.add(b, fill_value=0).astype(np.int64)
+
+        moments = {}
+        for col in dtypes:
+            a = self.moments.get(col)
+            b = other.moments.get(col)
+            if a is not None or b is not None:
+                moments[col] = merge_moments(
+                    a if a is not None else np.zeros(5),
+                    b if b is not None else np.zeros(5),
+                )
+
+        return FramePartial(dtypes, self.rows + other.rows, counts, moments)
+
+    def describe(self):
+        """Unformatted extended_describe table for the numeric columns."""
+        table = {}
+        for col, (n, mean, m2, m3, m4) in self.moments.items():
+            counts = self.counts[col].sort_index()
+            values = counts.index.to_numpy(dtype=np.float64)
+            col_counts = counts.to_numpy()
+            q1, q2, q3 = (
+                counts_quantile(values, col_counts, q) for q in (0.25, 0.5, 0.75)
+            )
+            table[col] = [
+                n,
+                mean if n else np.nan,
+                np.sqrt(m2 / (n - 1)) if n > 1 else np.nan,
+                values[0] if n else np.nan,
+                q1,
+                q2,
+                q3,
+                values[-1] if n else np.nan,
+                q3 - q1,
+                _skew(n, m2, m3),
+                _kurtosis(n, m2, m4),
+            ]
+        return pd.DataFrame(table, index=DESCRIBE_INDEX, dtype=np.float64)
+
+
+def iter_chunks(source, chunksize=100_000, normalize=True):
+    """Yield DataFrame chunks from a CSV/Parquet path or an iterable of frames."""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            chunks = (
+                batch.to_pandas()
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize)
+            )
+        else:
+            chunks = pd.read_csv(path, chunksize=chunksize)
+    else:
+        chunks = iter(source)
+
+    if not normalize:
+        yield from chunks
+        return
+
+    from dataset import normalize as normalize_frame
+
+    for chunk in chunks:
+        yield normalize_frame(chunk)
+
+
+def _share_frame(df):
+    # Copy each column once into a shared memory segment. Categoricals and
+    # strings travel as integer codes; only their (small) labels get pickled.
+    # Nullable numbers (Int64, Float64, boolean) travel as float64 with NaN
+    # and are rebuilt with their own dtype
+    specs = []
+    segments = []
+    for col in df.columns:
+        series = df[col]
+        labels = None
+        restore = None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values, labels = series.cat.codes.to_numpy(), series.cat.categories
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "iufb":
+            values = series.to_numpy()
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            restore = series.dtype
+        else:
+            values, labels = pd.factorize(series)
+
+        segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+        segments.append(segment)
+        specs.append(
+            (col, segment.name, values.dtype.str, len(values), labels, restore)
+        )
+    return specs, segments
+
+
+def _partial_for_rows(specs, start, stop):
+    segments = []
+    columns = {}
+    for col, name, dtype, length, labels, restore in specs:
+        # Pool workers share the parent's resource tracker, so attaching here
+        # does not hand ownership of the segment to the worker
+        segment = shared_memory.SharedMemory(name=name)
+        segments.append(segment)
+        values = np.ndarray((length,), dtype=dtype, buffer=segment.buf)[start:stop]
+        if labels is not None:
+            values = pd.Categorical.from_codes(values, categories=labels)
+        elif restore is not None:
+            values = pd.array(values, dtype=restore)
+        columns[col] = values
+
+    partial = FramePartial.from_frame(pd.DataFrame(columns, copy=False))
+    del columns, values
+    for segment in segments:
+        segment.close()
+    return partial
+
+
+def parallel_partial(df, n_jobs=None, partitions=None):
+    """Compute a FramePartial over row slices of `df` in a process pool."""
+    n_jobs = n_jobs or os.cpu_count() or 1
+    partitions = partitions or n_jobs
+    bounds = np.linspace(0, len(df), partitions + 1).astype(int)
+
+    specs, segments = _share_frame(df)
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            partials = list(
+                pool.map(
+                    _partial_for_rows,
+                    [specs] * partitions,
+                    bounds[:-1],
+                    bounds[1:],
+                )
+            )
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    partial = partials[0]
+    for other in partials[1:]:
+        partial = partial.merge(other)
+    # Workers only see codes; report the caller's dtypes
+    partial.dtypes = dict(df.dtypes)
+    return partial
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from dataset import CACHE_DIR
+
+METRICS_PATH = os.environ.get(
+    "APP_METRICS_PATH", os.path.join(CACHE_DIR, "metrics.jsonl")
+)
+
+logger = logging.getLogger("profiling")
+
+# Streamlit runs every rerun in its own thread, so each one sees its own profiler
+_current = ContextVar("profiler", default=None)
+
+
+class Profiler:
+    """Wall time, traced peak memory and chart payload size per section of a rerun.
+
+    Memory comes from tracemalloc, which is process wide: with several
+    sessions profiling at once the peaks include each other's allocations.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+
+    def _flush_peak(self):
+        # Fold the peak since the last reset into every open section
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def section(self, name):
+        self._flush_peak()
+        path = " / ".join([frame["name"] for frame in self._stack] + [name])
+        frame = {"name": name, "peak": 0}
+        record = dict(section=path, seconds=None, peak_mb=None, payload_kb=None)
+        self.records.append(record)
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._flush_peak()
+            self._stack.pop()
+            record["peak_mb"] = frame["peak"] / 2**20
+
+    def payload(self, fig):
+        # Serialize once more to measure what st.plotly_chart sends
+        import plotly.io as pio
+
+        with self.section("serialización") as record:
+            record["payload_kb"] = len(pio.to_json(fig, validate=False)) / 1024
+
+    def table(self):
+        return pd.DataFrame(
+            self.records, columns=["section", "seconds", "peak_mb", "payload_kb"]
+        )
+
+    def summary(self):
+        top = [r for r in self.records if " / " not in r["section"]]
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "seconds": sum(r["seconds"] or 0 for r in top),
+            "peak_mb": max((r["peak_mb"] or 0 for r in top), default=0),
+            "payload_kb": sum(r["payload_kb"] or 0 for r in self.records),
+            "sections": self.records,
+        }
+
+
+def write_metrics(record, metrics_path=METRICS_PATH):
+    # One JSON line to the "profiling" logger and the metrics file
+    line = json.dumps(record, ensure_ascii=False)
+    logger.info(line)
+    if metrics_path:
+        os.makedirs(os.path.dirname(metrics_path) or ".", exist_ok=True)
+        with open(metrics_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@contextmanager
+def profile_run(enabled, metrics_path=METRICS_PATH):
+    """Profile the sections of one rerun when `enabled`; otherwise every
+    section() and plotly_chart() call costs nothing extra. On exit the run is
+    logged as one JSON line and appended to `metrics_path`."""
+    if not enabled:
+        yield None
+        return
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    profiler = Profiler()
+    token = _current.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current.reset(token)
+        if started:
+            tracemalloc.stop()
+        write_metrics(profiler.summary(), metrics_path)
+
+
+@contextmanager
+def section(name):
+    profiler = _current.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.section(name) as record:
+        yield record
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, recording the size of the figure sent to the browser."""
+    profiler = _current.get()
+    if profiler is not None:
+        profiler.payload(fig)
+    return st.plotly_chart(fig, **kwargs)
+
+
+def display_profile(profiler):
+    if profiler is None:
+        return
+    summary = profiler.summary()
+    st.metric("Tiempo total", f"{summary['seconds']:.2f} s")
+    st.metric("Memoria máxima", f"{summary['peak_mb']:.1f} MB")
+    st.metric("Gráficos enviados", f"{summary['payload_kb']:,.0f} KB")
+    st.dataframe(
+        profiler.table().style.format(
+            {"seconds": "{:.3f}", "peak_mb": "{:.1f}", "payload_kb": "{:,.1f}"},
+            na_rep="",
+        ),
+        hide_index=True,
+    )
@@ -0,0 +1,110 @@
+import argparse
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import plotly.io as pio
+
+from aggregates import get_cube, save_cube
+from charts import CHARTS, service_averages
+from dataset import DATA_PATH, _read_meta, _write_atomic, _write_meta, load_dataset
+from helper_functions import extended_describe, summarize_dataframe
+
+REPORT_DIR = os.path.join("data", "report")
+MANIFEST = "manifest.json"
+
+
+def _as_parquet_table(df):
+    # Formatted tables mix numbers, strings and nulls in one column, which
+    # Parquet cannot store as object; keep them as nullable strings
+    return df.astype({col: "string" for col in df.columns if df[col].dtype == "object"})
+
+
+def _write_parquet(df, path):
+    _write_atomic(path, lambda tmp_path: df.to_parquet(tmp_path))
+
+
+def build_report(path=DATA_PATH, output=REPORT_DIR):
+    """Compute every table and figure of the dashboard once and write them
+    to `output`: Parquet for the tables and the cube, Plotly JSON for the
+    figures. The manifest is written last, so readers never see a report
+    half written."""
+    df = load_dataset(path)
+    cube = get_cube(df)
+    os.makedirs(os.path.join(output, "figures"), exist_ok=True)
+
+    _write_parquet(
+        _as_parquet_table(extended_describe(df)),
+        os.path.join(output, "extended_describe.parquet"),
+    )
+    _write_parquet(
+        _as_parquet_table(summarize_dataframe(df)),
+        os.path.join(output, "summary.parquet"),
+    )
+    _write_parquet(service_averages(cube), os.path.join(output, "averages.parquet"))
+    save_cube(cube, os.path.join(output, "cube"))
+
+    figures = []
+    for i, (column, name, figure) in enumerate(CHARTS):
+        file = os.path.join("figures", f"{i:02d}.json")
+        fig = figure(cube)
+        if fig.layout.template == pio.templates[pio.templates.default]:
+            # Let the viewer apply its own default (Streamlit's theme) on load
+            fig.layout.template = None
+        text = fig.to_json()
+
+        def write(tmp_path, text=text):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        _write_atomic(os.path.join(output, file), write)
+        figures.append({"column": column, "name": name, "file": file})
+
+    manifest = {
+        "source": os.path.abspath(path),
+        "fingerprint": df.attrs["fingerprint"],
+        "rows": len(df),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "figures": figures,
+    }
+    _write_meta(os.path.join(output, MANIFEST), manifest)
+    return manifest
+
+
+def load_report(directory=REPORT_DIR):
+    """Tables and figures written by build_report, without touching the data."""
+    manifest = _read_meta(os.path.join(directory, MANIFEST))
+    if manifest is None:
+        raise FileNotFoundError(f"No hay un reporte en {directory}")
+    figures = []
+    for figure in manifest["figures"]:
+        fig = pio.read_json(os.path.join(directory, figure["file"]))
+        figures.append((figure["column"], figure["name"], fig))
+    return {
+        "manifest": manifest,
+        "extended_describe": pd.read_parquet(
+            os.path.join(directory, "extended_describe.parquet")
+        ),
+        "summary": pd.read_parquet(os.path.join(directory, "summary.parquet")),
+        "averages": pd.read_parquet(os.path.join(directory, "averages.parquet")),
+        "figures": figures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precalcula las tablas y gráficos del dashboard"
+    )
+    parser.add_argument("path", nargs="?", default=DATA_PATH)
+    parser.add_argument("--output", default=REPORT_DIR)
+    args = parser.parse_args()
+
+    manifest = build_report(args.path, args.output)
+    print(
+        f"{len(manifest['figures'])} gráficos y {manifest['rows']:,} filas "
+        f"en {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
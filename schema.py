@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+RATING_COLUMNS = [
+    "Inflight Wifi Service",
+    "Departure/Arrival Time Convenient",
+    "Ease Of Online Booking",
+    "Gate Location",
+    "Food And Drink",
+    "Online Boarding",
+    "Seat Comfort",
+    "Inflight Entertainment",
+    "On-Board Service",
+    "Leg Room Service",
+    "Baggage Handling",
+    "Checkin Service",
+    "Inflight Service",
+    "Cleanliness",
+]
+
+CATEGORICAL_COLUMNS = [
+    "Gender",
+    "Customer Type",
+    "Type Of Travel",
+    "Class",
+    "Satisfaction",
+]
+
+# Same label fixes applied in analysis.ipynb when building airline_merged_clean.csv
+LABEL_FIXES = {
+    "Type Of Travel": {"Business travel": "Business Travel"},
+    "Customer Type": {"disloyal Customer": "Disloyal Customer"},
+    "Satisfaction": {
+        "neutral or dissatisfied": "Neutral or Dissatisfied",
+        "satisfied": "Satisfied",
+    },
+}
+
+# Columns dropped from raw files: the passenger id and the CSV index
+DROP_COLUMNS = ["Id"]
+
+# Null policies: "reject" drops the row, "keep" leaves a null value
+REJECT, KEEP = "reject", "keep"
+
+
+class Column:
+    """Expected type, allowed values and null policy of one survey column.
+
+    Categoricals list their `labels` (in category order) and the `fixes`
+    mapping raw labels onto them; numeric columns give a `dtype` and an
+    inclusive [minimum, maximum] range.
+    """
+
+    def __init__(
+        self,
+        dtype,
+        minimum=None,
+        maximum=None,
+        labels=None,
+        fixes=None,
+        nulls=REJECT,
+    ):
+        self.dtype = dtype
+        self.minimum = minimum
+        self.maximum = maximum
+        self.labels = labels
+        self.fixes = fixes or {}
+        self.nulls = nulls
+
+
+SURVEY_SCHEMA = {
+    "Gender": Column("category", labels=["Female", "Male"]),
+    "Customer Type": Column("category", labels=["Disloyal Customer", "Loyal Customer"]),
+    "Age": Column("int8", minimum=0, maximum=120),
+    "Type Of Travel": Column("category", labels=["Business Travel", "Personal Travel"]),
+    "Class": Column("category", labels=["Business", "Eco", "Eco Plus"]),
+    "Flight Distance": Column("int16", minimum=0, maximum=20_000),
+    **{col: Column("int8", minimum=0, maximum=5) for col in RATING_COLUMNS},
+    "Departure Delay In Minutes": Column("int16", minimum=0, maximum=10_000),
+    # About 0.3% of the answers have no arrival delay; they are kept as NaN
+    "Arrival Delay In Minutes": Column(
+        "float64", minimum=0, maximum=10_000, nulls=KEEP
+    ),
+    "Satisfaction": Column("category", labels=["Neutral or Dissatisfied", "Satisfied"]),
+}
+for _col in CATEGORICAL_COLUMNS:
+    SURVEY_SCHEMA[_col].fixes = LABEL_FIXES.get(_col, {})
+
+
+def schema_version(schema):
+    """Short hash of everything `schema` checks and converts; caches of
+    normalized data are only valid for the version that built them."""
+    spec = {col: vars(column) for col, column in schema.items()}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:8]
+
+
+SCHEMA_VERSION = schema_version(SURVEY_SCHEMA)
+
+
+def normalize_headers(df):
+    # Raw survey files (e.g. data/airline2.csv) still carry the index column,
+    # the passenger id and the original lowercase headers
+    unnamed = [col for col in df.columns if not col or col.startswith("Unnamed")]
+    df = df.drop(columns=unnamed)
+    df.columns = df.columns.str.title()
+    return df.drop(columns=DROP_COLUMNS, errors="ignore")
+
+
+def _categorical(series, column):
+    # Fix and check the (few) labels, then move every row through its code
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    labels = series.cat.categories.map(lambda value: column.fixes.get(value, value))
+    lookup = pd.Index(column.labels).get_indexer(labels)
+    codes = series.cat.codes.to_numpy()
+    recoded = np.where(codes >= 0, lookup[codes], -1)
+    values = pd.Categorical.from_codes(recoded, categories=column.labels)
+    return values, {
+        "nulo": codes < 0,
+        "valor no permitido": (codes >= 0) & (recoded < 0),
+    }
+
+
+def _numeric(series, column):
+    values = pd.to_numeric(series, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    missing = np.isnan(values)
+    problems = {
+        "nulo": missing & series.isna().to_numpy(),
+        "no numérico": missing & series.notna().to_numpy(),
+    }
+    with np.errstate(invalid="ignore"):
+        out_of_range = np.zeros(len(values), dtype=bool)
+        if column.minimum is not None:
+            out_of_range |= values < column.minimum
+        if column.maximum is not None:
+            out_of_range |= values > column.maximum
+        problems["fuera de rango"] = out_of_range
+        if pd.api.types.is_integer_dtype(column.dtype):
+            problems["no entero"] = ~missing & (values != np.round(values))
+    return values, problems
+
+
+def validate(df, schema=SURVEY_SCHEMA):
+    """Normalize the headers, labels and types of a survey frame in one
+    vectorized pass per column and split off the rows that break `schema`.
+
+    Returns (clean, rejected): rejected holds the raw rows, with their
+    original index, and a "Motivo" column naming every problem found.
+    Columns the schema does not know are kept as they are; a missing schema
+    column is an error (ValueError), not an empty result.
+    """
+    df = normalize_headers(df)
+    missing = [col for col in schema if col not in df.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas del esquema: {', '.join(missing)}")
+    columns = {}
+    problems = []
+    for col, column in schema.items():
+        if column.dtype == "category":
+            values, found = _categorical(df[col], column)
+        else:
+            values, found = _numeric(df[col], column)
+        if column.nulls == KEEP:
+            found.pop("nulo")
+        columns[col] = values
+        problems.extend((f"{col}: {reason}", mask) for reason, mask in found.items())
+
+    bad = np.zeros(len(df), dtype=bool)
+    for _, mask in problems:
+        bad |= mask
+
+    rejected = df[bad].copy()
+    reasons = np.full(int(bad.sum()), "", dtype=object)
+    for reason, mask in problems:
+        reasons[mask[bad]] += f"{reason}; "
+    rejected["Motivo"] = [text.rstrip("; ") for text in reasons]
+
+    clean = df[~bad].copy()
+    for col, values in columns.items():
+        column = schema[col]
+        values = values[~bad]
+        clean[col] = (
+            values if column.dtype == "category" else values.astype(column.dtype)
+        )
+    return clean, rejected
+
+
+def rejection_counts(rejected):
+    """Rejected rows per problem (a row with several problems counts once
+    under each)."""
+    return rejected["Motivo"].str.split("; ").explode().value_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Valida un archivo de encuestas contra el esquema"
+    )
+    parser.add_argument("path", help="CSV de encuestas, p. ej. data/airline2.csv")
+    parser.add_argument("--rejected", help="CSV con las filas rechazadas")
+    args = parser.parse_args()
+
+    clean, rejected = validate(pd.read_csv(args.path))
+    print(f"{len(clean):,} filas válidas, {len(rejected):,} rechazadas")
+    if len(rejected):
+        print(rejection_counts(rejected).to_string())
+    if args.rejected:
+        rejected.to_csv(args.rejected)
+
+
+if __name__ == "__main__":
+    main()
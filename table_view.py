@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+
+def search_mask(df, query):
+    """Rows where any column matches `query`.
+
+    Categoricals are searched on their (few) labels and matched back through
+    the codes; numeric columns only match a query that parses as a number.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    query = query.strip()
+    try:
+        number = float(query)
+    except ValueError:
+        number = None
+
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            labels = series.cat.categories.astype(str)
+            matched = labels.str.contains(query, case=False, regex=False)
+            # Extra slot so null codes (-1) index a False
+            lookup = np.append(np.asarray(matched, dtype=bool), False)
+            mask |= lookup[series.cat.codes.to_numpy()]
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            if number is not None:
+                mask |= series.to_numpy(dtype=np.float64, na_value=np.nan) == number
+        else:
+            contains = series.astype(str).str.contains(query, case=False, regex=False)
+            mask |= contains.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def sort_order(df, column, descending=False):
+    """Row positions sorted by `column`, nulls last, ties in row order."""
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Sort on the rank of each label rather than on the category order
+        ranks = np.argsort(np.argsort(series.cat.categories.astype(str)))
+        codes = series.cat.codes.to_numpy()
+        key = ranks[codes].astype(np.float64)
+        key[codes < 0] = np.nan
+    elif pd.api.types.is_numeric_dtype(series.dtype):
+        key = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        key = series.rank(method="dense").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # NaN sorts last in both directions
+    return np.argsort(-key if descending else key, kind="stable")
+
+
+def page_rows(df, order, page, page_size):
+    """Only the rows of one page, in `order`."""
+    start = (page - 1) * page_size
+    return df.take(order[start : start + page_size])
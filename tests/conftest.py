@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def survey():
+    """Synthetic answers: Seat Comfort depends on the satisfaction, Gate
+    Location does not, and Arrival Delay has some nulls."""
+    rng = np.random.default_rng(0)
+    n = 3_000
+    satisfied = rng.random(n) < 0.45
+    df = pd.DataFrame(
+        {
+            "Seat Comfort": np.clip(rng.integers(0, 5, n) + satisfied, 0, 5),
+            "Gate Location": rng.integers(1, 6, n),
+            "Arrival Delay": rng.exponential(15, n).round(),
+            "Satisfaction": np.where(satisfied, "Satisfied", "Neutral or Dissatisfied"),
+        }
+    )
+    df.loc[::17, "Arrival Delay"] = np.nan
+    return df
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import minmax_downsample
+
+
+def test_minmax_downsample_keeps_spikes():
+    values = np.zeros(10_000)
+    values[1234], values[8765] = 50, -50
+    positions, sampled = minmax_downsample(pd.Series(values), max_points=200)
+    assert len(positions) <= 200
+    assert {1234, 8765} <= set(positions)
+    np.testing.assert_array_equal(sampled, values[positions])
+
+
+def test_minmax_downsample_keeps_null_categories():
+    series = pd.Series(["Eco", None, "Business", None] * 1_000, dtype="category")
+    for max_points in (2000, 10_000):
+        positions, sampled = minmax_downsample(series, max_points=max_points)
+        expected = series.to_numpy(dtype=object)[positions]
+        missing = pd.isna(expected)
+        np.testing.assert_array_equal(pd.isna(sampled), missing)
+        assert list(sampled[~missing]) == list(expected[~missing])
+        assert "Eco" in sampled and "Business" in sampled
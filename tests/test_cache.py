@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import cache
+from cache import FingerprintCache, estimate_size, memoize
+
+
+def array(kb):
+    return np.zeros(kb * 128)  # kb kibibytes of float64
+
+
+def frame(fingerprint, **attrs):
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    df.attrs.update(fingerprint=fingerprint, **attrs)
+    return df
+
+
+def test_byte_bound_evicts_least_recently_used():
+    store = FingerprintCache(max_bytes=3 * 1024)
+    for key in "abc":
+        store.set(key, array(1))
+    store.get("a")
+    store.set("d", array(1))
+    assert store.get("b") is None
+    assert all(store.get(key) is not None for key in "acd")
+    assert store.nbytes <= store.max_bytes
+
+    # Larger than the whole budget: never stored
+    store.set("e", array(4))
+    assert store.get("e") is None and len(store) == 3
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    store = FingerprintCache(ttl=60)
+    store.set("a", 1)
+    now[0] += 59
+    assert store.get("a") == 1
+    now[0] += 2
+    assert store.get("a", "expirado") == "expirado"
+    assert len(store) == 0
+
+
+def test_persisted_pickle_is_reloaded(tmp_path):
+    FingerprintCache(persist_dir=tmp_path).set("fp-a", {"v": array(1)}, persist=True)
+    fresh = FingerprintCache(persist_dir=tmp_path)
+    value = fresh.get("fp-a")
+    np.testing.assert_array_equal(value["v"], array(1))
+    assert len(fresh) == 1  # now also in memory
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    fresh.invalidate("fp")
+    assert FingerprintCache(persist_dir=tmp_path).get("fp-a") is None
+
+
+def test_disk_budget_keeps_recently_read(tmp_path):
+    store = FingerprintCache(persist_dir=tmp_path, max_disk_bytes=250_000)
+    for key in ["k0", "k1", "k2"]:
+        store.set(key, array(78), persist=True)
+        time.sleep(0.01)
+    FingerprintCache(persist_dir=tmp_path).get("k0")
+    store.set("k3", array(78), persist=True)
+    assert sorted(os.listdir(tmp_path)) == ["k0.pkl", "k2.pkl", "k3.pkl"]
+
+
+def test_memoize_builds_each_key_once():
+    store = FingerprintCache()
+    calls = []
+
+    @memoize(cache=store)
+    def slow(data, n):
+        calls.append(n)
+        time.sleep(0.2)
+        return len(data) * n
+
+    data = frame("fp-once")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(slow(data, 2))) for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [6] * 6 and calls == [2]
+    assert slow(data, 3) == 9 and calls == [2, 3]
+
+
+def test_memoize_persists_only_the_full_dataset(tmp_path):
+    store = FingerprintCache(persist_dir=tmp_path)
+
+    @memoize(persist=True, cache=store)
+    def rows(data):
+        return len(data)
+
+    rows(frame("full"))
+    rows(frame("subset", selection=(("Class", ("Eco",)),)))
+    assert [name.split("-")[0] for name in os.listdir(tmp_path)] == ["full"]
+    assert len(store) == 2
+
+
+def test_estimate_size_follows_objects():
+    class Holder:
+        def __init__(self):
+            self.bitmaps = {"a": array(64), "b": [array(64)]}
+
+    assert estimate_size(Holder()) >= 128 * 1024
+    shared = array(64)
+    assert estimate_size([shared, shared]) < 2 * shared.nbytes
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from correlation import RESULT_COLUMNS, correlations
+
+
+def test_correlations_match_scipy(survey):
+    result = correlations(survey)
+    assert list(result.columns) == RESULT_COLUMNS
+    assert list(result.index) == ["Seat Comfort", "Gate Location", "Arrival Delay"]
+
+    for col in result.index:
+        rows = survey[col].notna()
+        x = survey.loc[rows, col].to_numpy(dtype=np.float64)
+        y = (survey.loc[rows, "Satisfaction"] == "Satisfied").to_numpy(dtype=float)
+        expected = {
+            "spearman": stats.spearmanr(x, y),
+            "biserial": stats.pointbiserialr(y, x),
+            "kendall": stats.kendalltau(x, y),
+        }
+        for method, (corr, p_value) in expected.items():
+            assert result.loc[col, f"correlation_{method}"] == pytest.approx(corr)
+            assert result.loc[col, f"p-value_{method}"] == pytest.approx(
+                p_value, rel=1e-6, abs=1e-300
+            )
+
+
+def test_constant_column_has_no_correlation(survey):
+    survey["Constant"] = 3
+    result = correlations(survey, columns=["Constant"])
+    assert result.loc["Constant"].isna().all()
+
+
+def test_numeric_target(survey):
+    encoded = survey.assign(
+        Satisfaction=(survey["Satisfaction"] == "Satisfied").astype(int)
+    )
+    pd.testing.assert_frame_equal(correlations(encoded), correlations(survey))
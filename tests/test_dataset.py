@@ -0,0 +1,58 @@
+import json
+
+import pandas as pd
+import pytest
+
+from dataset import DATA_PATH, _cache_paths, load_dataset, load_shared
+
+
+@pytest.fixture
+def raw():
+    return pd.read_csv(DATA_PATH, nrows=400)
+
+
+def test_same_name_in_different_directories(raw, tmp_path):
+    paths = []
+    for name, rows in [("a", raw.iloc[:100]), ("b", raw.iloc[100:])]:
+        (tmp_path / name).mkdir()
+        paths.append(tmp_path / name / "survey.csv")
+        rows.to_csv(paths[-1], index=False)
+
+    cache_dir = tmp_path / "cache"
+    first = load_dataset(str(paths[0]), cache_dir)
+    second = load_dataset(str(paths[1]), cache_dir)
+    again = load_dataset(str(paths[0]), cache_dir)
+    assert (len(first), len(second), len(again)) == (100, 300, 100)
+    assert again.attrs["fingerprint"] == first.attrs["fingerprint"]
+    assert first.attrs["fingerprint"] != second.attrs["fingerprint"]
+
+
+def test_old_cache_version_is_rebuilt(raw, tmp_path):
+    path = tmp_path / "survey.csv"
+    raw.to_csv(path, index=False)
+    cache_dir = tmp_path / "cache"
+    load_dataset(str(path), cache_dir)
+
+    # A copy from an older layout, claiming to hold no rows
+    parquet_path, meta_path = _cache_paths(str(path), cache_dir)
+    meta = json.loads(open(meta_path).read())
+    del meta["version"]
+    open(meta_path, "w").write(json.dumps(meta))
+    raw.iloc[:0].to_parquet(parquet_path)
+
+    assert len(load_dataset(str(path), cache_dir)) == len(raw)
+
+
+def test_load_shared_keeps_other_datasets(raw, tmp_path):
+    cache_dir = tmp_path / "cache"
+    for name, rows in [("survey", raw.iloc[:100]), ("survey-2024", raw.iloc[100:])]:
+        rows.to_csv(tmp_path / f"{name}.csv", index=False)
+        load_shared(str(tmp_path / f"{name}.csv"), cache_dir)
+    assert len([p for p in cache_dir.iterdir() if p.suffix == ".arrow"]) == 2
+
+    # A new version of survey.csv replaces only its own copy
+    raw.iloc[:50].to_csv(tmp_path / "survey.csv", index=False)
+    assert len(load_shared(str(tmp_path / "survey.csv"), cache_dir)) == 50
+    arrows = [p for p in cache_dir.iterdir() if p.suffix == ".arrow"]
+    assert len(arrows) == 2
+    assert len(load_shared(str(tmp_path / "survey-2024.csv"), cache_dir)) == 300
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from hypothesis_tests import chi_square, ks_normal, mann_whitney, normal_test, run_tests
+
+
+def counts(values, levels=np.arange(6)):
+    return np.array([(values == level).sum() for level in levels])
+
+
+def test_chi_square_matches_scipy(survey):
+    for col in ["Seat Comfort", "Gate Location"]:
+        crosstab = pd.crosstab(survey[col], survey["Satisfaction"])
+        table = crosstab.reindex(np.arange(6), fill_value=0).to_numpy()
+        expected = stats.chi2_contingency(crosstab)
+        assert chi_square(table) == pytest.approx(expected[:2])
+
+
+def test_chi_square_two_by_two_uses_yates():
+    table = np.array([[30, 10], [20, 25]])
+    assert chi_square(table) == pytest.approx(stats.chi2_contingency(table)[:2])
+
+
+def test_mann_whitney_matches_scipy(survey):
+    satisfied = survey["Satisfaction"] == "Satisfied"
+    for col in ["Seat Comfort", "Gate Location"]:
+        x, y = survey.loc[satisfied, col], survey.loc[~satisfied, col]
+        expected = stats.mannwhitneyu(x, y, method="asymptotic")
+        assert mann_whitney(counts(x), counts(y)) == pytest.approx(
+            (expected.statistic, expected.pvalue)
+        )
+
+
+def test_normality_tests_match_scipy(survey):
+    values = survey["Seat Comfort"].to_numpy()
+    totals = counts(values)
+    present = totals > 0
+    levels = np.arange(6.0)[present]
+    assert normal_test(levels, totals[present]) == pytest.approx(
+        tuple(stats.normaltest(values))
+    )
+    expected = stats.kstest(
+        values, "norm", args=(values.mean(), values.std(ddof=1)), method="asymp"
+    )
+    statistic, _ = ks_normal(levels, totals[present])
+    assert statistic == pytest.approx(expected.statistic)
+
+
+def test_run_tests_table(survey):
+    result = run_tests(survey)
+    assert list(result.columns) == ["question", "test", "statistic", "p_value"]
+    assert set(result["question"]) == {"Seat Comfort", "Gate Location"}
+    assert len(result) == 2 * 4
+    assert result["p_value"].between(0, 1).all()
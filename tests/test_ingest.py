@@ -0,0 +1,104 @@
+import os
+
+import pandas as pd
+import pytest
+
+from aggregates import CUBE_KEYS, build_cube, cube_directory, load_cube
+from dataset import load_partitions, read_manifest
+from helper_functions import format_numbers, summarize_partial
+from ingest import _state_path, ingest, load_totals
+from partial_stats import FramePartial
+
+
+def sorted_cube(cube):
+    return {
+        name: cube[name]
+        .astype({"Count": "int64"})
+        .sort_values(keys)
+        .reset_index(drop=True)
+        for name, keys in CUBE_KEYS.items()
+    }
+
+
+def assert_cubes_equal(a, b):
+    a, b = sorted_cube(a), sorted_cube(b)
+    for name in CUBE_KEYS:
+        pd.testing.assert_frame_equal(a[name], b[name], check_dtype=False)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    raw = pd.read_csv("data/airline2.csv", nrows=700)
+    raw.iloc[:400].to_csv(tmp_path / "first.csv", index=False)
+    raw.iloc[400:].to_csv(tmp_path / "second.csv", index=False)
+    return {
+        "paths": [str(tmp_path / "first.csv"), str(tmp_path / "second.csv")],
+        "directory": str(tmp_path / "partitions"),
+        "eda_dir": str(tmp_path / "eda"),
+        "cache_dir": str(tmp_path / "cache"),
+    }
+
+
+def run(dirs, paths):
+    return ingest(
+        paths,
+        dirs["directory"],
+        dirs["eda_dir"],
+        dirs["cache_dir"],
+        chunksize=150,
+    )
+
+
+def test_incremental_ingest_matches_full_recompute(dirs):
+    first, second = dirs["paths"]
+    run(dirs, [first])
+    run(dirs, [second])
+    manifest = read_manifest(dirs["directory"])
+    assert [len(batch["partitions"]) for batch in manifest["batches"]] == [3, 2]
+
+    full = load_partitions(dirs["directory"])
+    assert len(full) == 700
+    total = load_totals(dirs["directory"], manifest)
+    expected = FramePartial.from_frame(full)
+    pd.testing.assert_frame_equal(total["partial"].describe(), expected.describe())
+    assert_cubes_equal(total["cube"], build_cube(full))
+
+    # Artifacts written by the last run
+    with open(os.path.join(dirs["eda_dir"], "extended_describe.csv")) as f:
+        assert f.read() == expected.describe().map(format_numbers).to_csv()
+    with open(os.path.join(dirs["eda_dir"], "summary.csv")) as f:
+        assert f.read() == summarize_partial(expected).to_csv(index=False)
+    saved = load_cube(cube_directory(full.attrs["fingerprint"], dirs["cache_dir"]))
+    assert_cubes_equal(saved, build_cube(full))
+
+
+def test_unchanged_file_is_skipped(dirs):
+    first, _ = dirs["paths"]
+    run(dirs, [first])
+    files = {
+        name: os.stat(os.path.join(dirs["directory"], name)).st_mtime_ns
+        for name in os.listdir(dirs["directory"])
+        if name.endswith(".parquet")
+    }
+    manifest = run(dirs, [first])
+    assert len(manifest["batches"]) == 1
+    assert {
+        name: os.stat(os.path.join(dirs["directory"], name)).st_mtime_ns
+        for name in files
+    } == files
+    assert sorted(
+        name for name in os.listdir(dirs["directory"]) if name.endswith(".parquet")
+    ) == sorted(files)
+
+
+def test_missing_partition_state_is_rebuilt(dirs):
+    first, second = dirs["paths"]
+    run(dirs, [first, second])
+    manifest = read_manifest(dirs["directory"])
+    expected = load_totals(dirs["directory"], manifest)["partial"].describe()
+
+    os.remove(_state_path(dirs["directory"], "total"))
+    partition = manifest["batches"][1]["partitions"][0]["file"]
+    os.remove(_state_path(dirs["directory"], os.path.splitext(partition)[0]))
+    total = load_totals(dirs["directory"], manifest)
+    pd.testing.assert_frame_equal(total["partial"].describe(), expected)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from scipy import stats
+
+from knime_batches import ROW_ID, LocalIO, accumulate, correlation_table, run_node
+
+
+@pytest.fixture
+def table(survey):
+    # The columns of airline_correlation2.csv: a 0/1 target, nulls as NaN
+    return survey.assign(
+        Satisfaction=(survey["Satisfaction"] == "Satisfied").astype(np.int64)
+    ).rename(columns=str.lower)
+
+
+def expected(df, question, method):
+    rows = df[[question, "satisfaction"]].dropna()
+    if method == "spearman":
+        return stats.spearmanr(rows[question], rows["satisfaction"])
+    return stats.pointbiserialr(rows["satisfaction"], rows[question])
+
+
+@pytest.mark.parametrize("method", ["spearman", "biserial"])
+def test_nodes_match_scipy(table, method):
+    knio = LocalIO(table, batch_size=700)
+    run_node(knio, method)
+    result = knio.output_tables[0].to_pandas().set_index("question")
+    assert list(result.index) == ["seat comfort", "gate location", "arrival delay"]
+    for question in result.index:
+        corr, p_value = expected(table, question, method)
+        assert result.loc[question, f"{method}_correlation"] == pytest.approx(corr)
+        assert result.loc[question, f"{method}_p_value"] == pytest.approx(
+            p_value, rel=1e-6, abs=1e-300
+        )
+
+
+def test_batches_carry_row_ids(table, tmp_path):
+    batch = next(LocalIO(table, batch_size=700).input_tables[0].batches())
+    assert batch.to_pyarrow().schema.names[0] == ROW_ID
+    path = tmp_path / "table.csv"
+    table.to_csv(path, index=False)
+    frame = LocalIO(str(path), batch_size=700).input_tables[0].to_pandas()
+    assert list(frame.index[[0, -1]]) == ["Row0", "Row2999"]
+
+
+def test_tables_do_not_depend_on_batching(table):
+    arrow = pa.Table.from_pandas(table, preserve_index=False)
+    whole = correlation_table(accumulate(arrow.to_batches()), "spearman")
+    batched = correlation_table(
+        accumulate(arrow.to_batches(max_chunksize=333)), "spearman"
+    )
+    pd.testing.assert_frame_equal(whole, batched)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper_functions import extended_describe, summarize_dataframe
+from partial_stats import FramePartial, central_moments, merge_moments
+
+
+def test_merged_moments_match_one_pass():
+    values = np.random.default_rng(0).gamma(2.0, size=10_001)
+    merged = central_moments(values[:3])
+    for part in np.array_split(values[3:], 9):
+        merged = merge_moments(merged, central_moments(part))
+    np.testing.assert_allclose(merged, central_moments(values), rtol=1e-10)
+
+
+def test_merge_with_empty_partial():
+    moments = central_moments(np.array([1.0, 2.0, 4.0]))
+    np.testing.assert_array_equal(merge_moments(moments, np.zeros(5)), moments)
+    np.testing.assert_array_equal(merge_moments(np.zeros(5), moments), moments)
+
+
+def test_chunked_describe_matches_pandas():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        {
+            "x": rng.exponential(size=20_000),
+            "rating": rng.integers(0, 6, 20_000),
+        }
+    )
+    df.loc[::13, "x"] = np.nan
+    chunks = [df.iloc[i : i + 3_000] for i in range(0, len(df), 3_000)]
+    describe = FramePartial.from_chunks(chunks).describe()
+    expected = df.describe().rename(
+        {
+            "count": "Total de valores",
+            "mean": "Media",
+            "std": "Desviación estándar",
+            "min": "Mínimo",
+            "25%": "Q1",
+            "50%": "Q2",
+            "75%": "Q3",
+            "max": "Máximo",
+        }
+    )
+    for col in df.columns:
+        for stat in expected.index:
+            assert describe.loc[stat, col] == pytest.approx(expected.loc[stat, col])
+        values = df[col].dropna()
+        assert describe.loc["Asimetría", col] == pytest.approx(values.skew())
+        assert describe.loc["Curtosis", col] == pytest.approx(values.kurt())
+
+
+def test_parallel_matches_serial_on_nullable_columns():
+    rng = np.random.default_rng(2)
+    ages = pd.array(rng.integers(18, 80, 5_000), dtype="Int64")
+    ages[::7] = pd.NA
+    df = pd.DataFrame(
+        {
+            "Age": ages,
+            "Delay": pd.array(rng.exponential(10, 5_000), dtype="Float64"),
+            "Class": pd.Categorical(rng.choice(["Eco", "Business"], 5_000)),
+        }
+    )
+    serial = extended_describe(df)
+    parallel = extended_describe(df, n_jobs=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert "Age" in parallel.columns
+    pd.testing.assert_frame_equal(
+        summarize_dataframe(df, n_jobs=2), summarize_dataframe(df)
+    )
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import SURVEY_SCHEMA, validate
+
+
+@pytest.fixture
+def raw():
+    # Headers, index column and labels as in data/airline2.csv
+    return pd.read_csv("data/airline2.csv", nrows=8)
+
+
+def test_clean_rows_are_typed(raw):
+    clean, rejected = validate(raw)
+    assert len(clean) == len(raw) and rejected.empty
+    assert list(clean.columns) == list(SURVEY_SCHEMA)
+    for col, column in SURVEY_SCHEMA.items():
+        if column.dtype == "category":
+            assert list(clean[col].cat.categories) == column.labels
+        else:
+            assert clean[col].dtype == np.dtype(column.dtype)
+    assert set(clean["Type Of Travel"]) <= {"Business Travel", "Personal Travel"}
+    assert set(clean["Satisfaction"]) <= {"Neutral or Dissatisfied", "Satisfied"}
+
+
+def test_rejection_reasons(raw):
+    raw["Age"] = raw["Age"].astype(object)
+    raw.loc[1, "Inflight wifi service"] = 7
+    raw.loc[2, "Class"] = "First"
+    raw.loc[3, "Age"] = 30.5
+    raw.loc[4, "satisfaction"] = None
+    raw.loc[5, "Age"] = "treinta"
+    raw.loc[6, "Class"] = "First"
+    raw.loc[6, "Cleanliness"] = -1
+
+    clean, rejected = validate(raw)
+    assert list(clean.index) == [0, 7]
+    assert rejected["Motivo"].to_dict() == {
+        1: "Inflight Wifi Service: fuera de rango",
+        2: "Class: valor no permitido",
+        3: "Age: no entero",
+        4: "Satisfaction: nulo",
+        5: "Age: no numérico",
+        6: "Class: valor no permitido; Cleanliness: fuera de rango",
+    }
+    # Rejected rows keep their raw values
+    assert rejected.loc[5, "Age"] == "treinta"
+    assert clean["Age"].dtype == np.int8
+
+
+def test_missing_arrival_delay_is_kept(raw):
+    raw.loc[0, "Arrival Delay in Minutes"] = np.nan
+    clean, rejected = validate(raw)
+    assert rejected.empty
+    assert np.isnan(clean.loc[0, "Arrival Delay In Minutes"])
+
+
+def test_missing_schema_column(raw):
+    with pytest.raises(ValueError, match="Satisfaction"):
+        validate(raw.drop(columns="satisfaction"))
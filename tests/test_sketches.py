@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import (
+    DistinctCounter,
+    FrequentItems,
+    QuantileSketch,
+    SketchPartial,
+    row_blocks,
+)
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def rank_error(sorted_values, value, q):
+    # Distance from q to the range of ranks `value` holds in the data
+    low = np.searchsorted(sorted_values, value, side="left") / len(sorted_values)
+    high = np.searchsorted(sorted_values, value, side="right") / len(sorted_values)
+    return max(0.0, low - q, q - high)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.random.default_rng(0).normal(size=200_000),
+        np.random.default_rng(1).integers(0, 6, 200_000).astype(np.int8),
+        np.random.default_rng(2).exponential(50, 200_000).round().astype(np.int16),
+    ],
+    ids=["normal", "ratings", "delays"],
+)
+def test_quantiles_within_rank_error(values):
+    sketch = QuantileSketch(k=200, block=10_000).update(values)
+    exact = np.sort(values)
+    for q in QUANTILES:
+        assert rank_error(exact, sketch.quantile(q), q) <= sketch.rank_error
+
+
+def test_merged_quantiles_within_rank_error():
+    values = np.random.default_rng(3).lognormal(size=300_000)
+    parts = [
+        QuantileSketch(seed=i).update(part)
+        for i, part in enumerate(np.array_split(values, 7))
+    ]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged = merged.merge(part)
+    assert merged.n == len(values)
+    exact = np.sort(values)
+    for q in QUANTILES:
+        assert rank_error(exact, merged.quantile(q), q) <= merged.rank_error
+
+
+def test_quantile_sketch_stays_bounded():
+    sketch = QuantileSketch(k=100, block=4096).update(np.arange(1_000_000.0))
+    assert sum(len(level) for level in sketch.levels) < 20 * sketch.k
+
+
+def test_quantile_sketch_skips_nan():
+    values = np.array([np.nan, 1.0, 2.0, 3.0, np.nan])
+    sketch = QuantileSketch().update(values)
+    assert sketch.n == 3
+    assert sketch.quantile(0.5) == 2.0
+
+
+@pytest.mark.parametrize("distinct", [50, 5_000, 200_000])
+def test_distinct_count_within_error(distinct):
+    values = pd.Series(np.random.default_rng(4).permutation(distinct * 3) % distinct)
+    counter = DistinctCounter(precision=12).update(values)
+    # Three standard errors
+    assert abs(counter.estimate() - distinct) <= 3 * counter.relative_error * distinct
+
+
+def test_distinct_count_merges_like_one_pass():
+    values = pd.Series(np.arange(100_000))
+    whole = DistinctCounter().update(values)
+    halves = DistinctCounter().update(values.iloc[:60_000])
+    halves = halves.merge(DistinctCounter().update(values.iloc[40_000:]))
+    assert halves.estimate() == whole.estimate()
+
+
+def test_distinct_count_of_categoricals():
+    values = pd.Series(pd.Categorical(["a", "b", None, "c", "a"]))
+    assert round(DistinctCounter().update(values).estimate()) == 3
+
+
+def test_frequent_items_bounds():
+    rng = np.random.default_rng(5)
+    values = pd.Series(np.minimum(rng.zipf(1.5, 100_000), 10_000))
+    sketch = FrequentItems(counters=32, block=8_192).update(values)
+    exact = values.value_counts()
+    assert sketch.error <= len(values) / 33
+    for value, count in sketch.counts.items():
+        assert exact[value] - sketch.error <= count <= exact[value]
+    assert sketch.mode()[0] == exact.idxmax()
+
+
+def test_sketch_partial_exact_parts():
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(size=50_000),
+            "rating": rng.integers(0, 6, 50_000).astype(np.int8),
+            "label": pd.Categorical(rng.choice(["a", "b", "c"], 50_000)),
+        }
+    )
+    df.loc[::97, "x"] = np.nan
+    partial = SketchPartial.from_chunks(row_blocks(df, 4_096))
+    assert partial.rows == len(df)
+    assert partial.nulls["x"] == df["x"].isna().sum()
+    assert partial.extremes["rating"] == (df["rating"].min(), df["rating"].max())
+    describe = partial.describe()
+    for col in ["x", "rating"]:
+        assert describe.loc["Media", col] == pytest.approx(df[col].mean())
+        assert describe.loc["Desviación estándar", col] == pytest.approx(df[col].std())
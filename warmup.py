@@ -0,0 +1,124 @@
+import argparse
+import importlib
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from profiling import METRICS_PATH, write_metrics
+
+# Seconds spent in the first import of every module loaded on demand
+IMPORT_TIMES = {}
+
+# Modules the dashboard only needs once a section asks for them
+DEFERRED_MODULES = ["charts", "report"]
+
+
+def timed_import(name):
+    """importlib.import_module, recording how long the first import took."""
+    # import_module, unlike a sys.modules lookup, waits for a module another
+    # thread (the warmup) is still importing
+    loaded = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not loaded:
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class Warmup:
+    """Import `modules`, then run named steps once, in order, on a daemon
+    thread, timing each.
+
+    A failing step is recorded and skipped: it only leaves a cache cold for
+    the first visitor who needs it.
+    """
+
+    def __init__(self, steps, modules=DEFERRED_MODULES, metrics_path=METRICS_PATH):
+        self.steps = steps
+        self.modules = modules
+        self.metrics_path = metrics_path
+        self.records = []
+        self.done = threading.Event()
+
+    def run(self):
+        for name in self.modules:
+            timed_import(name)
+        for name, step in self.steps:
+            record = {"step": name, "seconds": None, "error": None}
+            self.records.append(record)
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as exc:
+                record["error"] = repr(exc)
+            record["seconds"] = time.perf_counter() - start
+        self.done.set()
+        write_metrics(self.summary(), self.metrics_path)
+        return self
+
+    def start(self):
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+        return self
+
+    def summary(self):
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "warmup_seconds": sum(r["seconds"] or 0 for r in self.records),
+            "imports": dict(IMPORT_TIMES),
+            "warmup": list(self.records),
+        }
+
+    def table(self):
+        imports = [
+            {"step": f"import {name}", "seconds": seconds, "error": None}
+            for name, seconds in IMPORT_TIMES.items()
+        ]
+        return pd.DataFrame(
+            imports + list(self.records), columns=["step", "seconds", "error"]
+        )
+
+
+def display_warmup(warmup):
+    if warmup is None:
+        return
+    state = "terminado" if warmup.done.is_set() else "en curso"
+    st.metric(
+        f"Precalentamiento ({state})", f"{warmup.summary()['warmup_seconds']:.2f} s"
+    )
+    st.dataframe(
+        warmup.table().style.format({"seconds": "{:.3f}"}, na_rep=""),
+        hide_index=True,
+    )
+
+
+def main():
+    # Run before `streamlit run app.py` so the Parquet and Arrow copies of
+    # the data and the persisted cube exist before the first visitor
+    from aggregates import get_cube
+    from dataset import DATA_PATH, load_shared
+
+    parser = argparse.ArgumentParser(
+        description="Precalienta las cachés del dashboard antes de recibir visitas"
+    )
+    parser.add_argument("path", nargs="?", default=DATA_PATH)
+    args = parser.parse_args()
+
+    data = {}
+    steps = [
+        ("Carga de datos", lambda: data.update(df=load_shared(args.path))),
+        ("Cubo", lambda: get_cube(data["df"])),
+    ]
+    warmup = Warmup(steps).run()
+    print(warmup.table().drop(columns="error").to_string(index=False))
+    errors = [r for r in warmup.records if r["error"]]
+    for record in errors:
+        print(f"{record['step']}: {record['error']}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()